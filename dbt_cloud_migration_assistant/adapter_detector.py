@@ -1,6 +1,7 @@
 """Detect dbt adapters and environment variables from dbt Cloud environments"""
 
-from typing import List, Dict, Any, Set, Optional
+import functools
+from typing import List, Dict, Any, Set, Optional, Tuple
 
 
 # Mapping of dbt Cloud connection types to dbt adapter packages
@@ -34,6 +35,181 @@ ADAPTER_MAPPING = {
     "vertica": "dbt-vertica",
 }
 
+# Connection fields that may hold the connection type, in priority order
+_CONNECTION_TYPE_KEYS = ("type", "connection_type", "adapter_type")
+
+# Environment variables extracted for every connection type. Each entry maps
+# the source fields (tried in order) to the variable suffix, and whether the
+# value is a secret that must be replaced with a placeholder.
+_COMMON_FIELDS: Tuple[Tuple[Tuple[str, ...], str, bool], ...] = (
+    (("account",), "ACCOUNT", False),
+    (("database",), "DATABASE", False),
+    (("schema",), "SCHEMA", False),
+    (("warehouse",), "WAREHOUSE", False),
+    (("user",), "USER", False),
+    (("host",), "HOST", False),
+    (("port",), "PORT", False),
+    (("password",), "PASSWORD", True),
+    (("token",), "TOKEN", True),
+    (("private_key",), "PRIVATE_KEY", True),
+)
+
+# Connection-type-specific environment variables. Each entry maps the source
+# fields (tried in order) to the variable suffix, e.g. DBT_PROD_ROLE.
+# Redshift, Teradata and Postgres only use the common host/user/database fields.
+_CONNECTION_TYPE_FIELDS: Dict[str, Tuple[Tuple[Tuple[str, ...], str], ...]] = {
+    "snowflake": ((("role",), "ROLE"),),
+    "bigquery": ((("project_id",), "PROJECT"), (("location",), "LOCATION")),
+    "databricks": ((("http_path",), "HTTP_PATH"),),
+    "spark": ((("method",), "METHOD"),),
+    "athena": ((("s3_staging_dir",), "S3_STAGING_DIR"), (("region_name",), "REGION")),
+    "trino": ((("catalog",), "CATALOG"),),
+    "synapse": ((("server", "host"), "SERVER"),),
+    "fabric": ((("server", "host"), "SERVER"),),
+}
+
+# Legacy aliases that are only read from the direct connection format, after
+# every source field of the variable with that suffix
+_DIRECT_ONLY_FIELDS = {"USER": "username", "PROJECT": "project"}
+
+# Connection types that share their field handling with another type
+_CONNECTION_TYPE_ALIASES = {
+    "alloydb": "postgres",
+    "apache_spark": "spark",
+    "starburst": "trino",
+    "azure_synapse": "synapse",
+    "microsoft_fabric": "fabric",
+}
+
+# Characters in environment names that are replaced when building variable names
+_ENV_NAME_TABLE = str.maketrans({" ": "_", "-": "_"})
+
+
+def _get_field_value(fields: Dict[str, Any], connection: Dict[str, Any], field_name: str) -> Any:
+    """Get a connection field value, preferring the nested format over the direct one"""
+    # Try nested format first (connection_details.fields)
+    if fields and isinstance(field_data := fields.get(field_name), dict) and (value := field_data.get("value")):
+        return value
+    # Fall back to direct format
+    return connection.get(field_name)
+
+
+def _get_first_field_value(
+    fields: Dict[str, Any], connection: Dict[str, Any], field_names: Tuple[str, ...]
+) -> Any:
+    """Get the first non-empty value among several connection fields"""
+    for field_name in field_names:
+        if value := _get_field_value(fields, connection, field_name):
+            return value
+    return None
+
+
+def _get_env_var_value(
+    fields: Dict[str, Any], connection: Dict[str, Any], field_names: Tuple[str, ...], suffix: str
+) -> Any:
+    """Get the value of the environment variable with the given suffix"""
+    if value := _get_first_field_value(fields, connection, field_names):
+        return value
+    if direct_field := _DIRECT_ONLY_FIELDS.get(suffix):
+        return connection.get(direct_field)
+    return None
+
+
+@functools.lru_cache(maxsize=128)
+def _resolve_adapter(connection_type: str) -> str:
+    """Resolve a dbt Cloud connection type to its dbt adapter package name"""
+    # Normalize to lowercase
+    connection_type = connection_type.lower()
+
+    # Map to adapter package
+    adapter = ADAPTER_MAPPING.get(connection_type)
+    if adapter:
+        return adapter
+    # Try direct match if not in mapping
+    if connection_type.startswith("dbt-"):
+        return connection_type
+    # Try common patterns
+    return f"dbt-{connection_type}"
+
+
+def _add_environment_adapters(env: Dict[str, Any], adapters: Set[str]):
+    """Add the dbt adapters required by a single environment to adapters"""
+    # Check connection details
+    connection = env.get("connection", {})
+    if connection:
+        # Try to get connection type from various possible fields
+        connection_type = next(
+            (value for key in _CONNECTION_TYPE_KEYS if (value := connection.get(key))), None
+        )
+
+        if connection_type:
+            adapters.add(_resolve_adapter(connection_type))
+
+    # Also check project-level adapter if available
+    project = env.get("project")
+    if project:
+        adapter_type = project.get("adapter_type")
+        if adapter_type:
+            adapter_type = adapter_type.lower()
+            adapter = ADAPTER_MAPPING.get(adapter_type)
+            if adapter:
+                adapters.add(adapter)
+
+
+def _add_environment_variables(env: Dict[str, Any], env_vars: Dict[str, str]):
+    """Add the variables extracted from a single environment to env_vars"""
+    env_name = env.get("name", "").translate(_ENV_NAME_TABLE).upper()
+    prefix = "DBT_" + env_name + "_"
+
+    # Extract connection credentials (we'll use placeholders for security)
+    connection = env.get("connection", {})
+    if connection:
+        # Extract connection details - they can be in different formats:
+        # 1. Direct format: connection.type, connection.host, etc.
+        # 2. Nested format: connection.connection_details.fields.{field}.value
+        connection_details = connection.get("connection_details", {})
+        fields = connection_details.get("fields", {}) if connection_details else {}
+        
+        # Get connection type
+        connection_type = (
+            _get_field_value(fields, connection, "type")
+            or connection.get("connection_type")
+            or "postgres"
+        )
+        if connection_type:
+            connection_type = connection_type.lower()
+        connection_type = _CONNECTION_TYPE_ALIASES.get(connection_type, connection_type)
+        
+        # Common connection variables (extract from nested structure if available).
+        # Passwords/tokens should be set manually (never extract actual values)
+        for source_fields, suffix, is_secret in _COMMON_FIELDS:
+            if value := _get_env_var_value(fields, connection, source_fields, suffix):
+                env_vars[prefix + suffix] = "<SET_MANUALLY>" if is_secret else str(value)
+
+        # Connection-specific variables
+        for source_fields, suffix in _CONNECTION_TYPE_FIELDS.get(connection_type, ()):
+            if value := _get_env_var_value(fields, connection, source_fields, suffix):
+                env_vars[prefix + suffix] = str(value)
+        if connection_type == "bigquery":
+            # BigQuery uses service account JSON keyfile
+            env_vars[prefix + "KEYFILE"] = "<SET_MANUALLY>"
+
+    # Extract custom environment variables if available
+    custom_env_vars = env.get("custom_environment_variables", {})
+    if custom_env_vars:
+        env_vars.update(custom_env_vars)
+
+
+def _add_job_environment_variables(jobs: List[Dict[str, Any]], env_vars: Dict[str, str]):
+    """Add job-level environment variables that aren't already set to env_vars"""
+    for job in jobs:
+        job_env_vars = job.get("environment_variables", {})
+        if job_env_vars:
+            # Environment-level values take precedence over job-level ones
+            env_vars.update(
+                (key, value) for key, value in job_env_vars.items() if key not in env_vars
+            )
+
 
 def detect_adapters(environments: List[Dict[str, Any]]) -> Set[str]:
     """
@@ -45,46 +221,9 @@ def detect_adapters(environments: List[Dict[str, Any]]) -> Set[str]:
     Returns:
         Set of required dbt adapter package names
     """
-    adapters = set()
-
+    adapters: Set[str] = set()
     for env in environments:
-        # Check connection details
-        connection = env.get("connection", {})
-        if connection:
-            # Try to get connection type from various possible fields
-            connection_type = (
-                connection.get("type")
-                or connection.get("connection_type")
-                or connection.get("adapter_type")
-            )
-
-            if connection_type:
-                # Normalize to lowercase
-                connection_type = connection_type.lower()
-
-                # Map to adapter package
-                adapter = ADAPTER_MAPPING.get(connection_type)
-                if adapter:
-                    adapters.add(adapter)
-                else:
-                    # Try direct match if not in mapping
-                    if connection_type.startswith("dbt-"):
-                        adapters.add(connection_type)
-                    else:
-                        # Try common patterns
-                        potential_adapter = f"dbt-{connection_type}"
-                        adapters.add(potential_adapter)
-
-        # Also check project-level adapter if available
-        project = env.get("project")
-        if project:
-            adapter_type = project.get("adapter_type")
-            if adapter_type:
-                adapter_type = adapter_type.lower()
-                adapter = ADAPTER_MAPPING.get(adapter_type)
-                if adapter:
-                    adapters.add(adapter)
-
+        _add_environment_adapters(env, adapters)
     return adapters
 
 
@@ -101,142 +240,37 @@ def extract_environment_variables(
     Returns:
         Dictionary of environment variable names to values (or placeholders)
     """
-    env_vars = {}
-
+    env_vars: Dict[str, str] = {}
     for env in environments:
-        env_name = env.get("name", "").upper().replace(" ", "_").replace("-", "_")
-
-        # Extract connection credentials (we'll use placeholders for security)
-        connection = env.get("connection", {})
-        if connection:
-            # Extract connection details - they can be in different formats:
-            # 1. Direct format: connection.type, connection.host, etc.
-            # 2. Nested format: connection.connection_details.fields.{field}.value
-            connection_details = connection.get("connection_details", {})
-            fields = connection_details.get("fields", {}) if connection_details else {}
-            
-            # Helper function to get field value (handles both formats)
-            def get_field_value(field_name: str, default=None):
-                # Try nested format first (connection_details.fields)
-                if fields:
-                    field_data = fields.get(field_name, {})
-                    if isinstance(field_data, dict):
-                        return field_data.get("value", default)
-                # Try direct format
-                return connection.get(field_name, default)
-            
-            # Get connection type
-            connection_type = (
-                get_field_value("type")
-                or connection.get("type")
-                or connection.get("connection_type")
-                or "postgres"
-            )
-            if connection_type:
-                connection_type = connection_type.lower()
-            
-            # Common connection variables (extract from nested structure if available)
-            account = get_field_value("account") or connection.get("account")
-            database = get_field_value("database") or connection.get("database")
-            schema = get_field_value("schema") or connection.get("schema")
-            warehouse = get_field_value("warehouse") or connection.get("warehouse")
-            user = get_field_value("user") or connection.get("user") or connection.get("username")
-            host = get_field_value("host") or connection.get("host")
-            port = get_field_value("port") or connection.get("port")
-            project_id = get_field_value("project_id") or connection.get("project_id") or connection.get("project")
-            
-            # Add common variables
-            if account:
-                env_vars[f"DBT_{env_name}_ACCOUNT"] = account
-            if database:
-                env_vars[f"DBT_{env_name}_DATABASE"] = database
-            if schema:
-                env_vars[f"DBT_{env_name}_SCHEMA"] = schema
-            if warehouse:
-                env_vars[f"DBT_{env_name}_WAREHOUSE"] = warehouse
-            if user:
-                env_vars[f"DBT_{env_name}_USER"] = user
-            if host:
-                env_vars[f"DBT_{env_name}_HOST"] = host
-            if port:
-                env_vars[f"DBT_{env_name}_PORT"] = str(port)
-            
-            # Password/token should be set manually (never extract actual values)
-            if get_field_value("password") or connection.get("password"):
-                env_vars[f"DBT_{env_name}_PASSWORD"] = "<SET_MANUALLY>"
-            if get_field_value("token") or connection.get("token"):
-                env_vars[f"DBT_{env_name}_TOKEN"] = "<SET_MANUALLY>"
-            if get_field_value("private_key") or connection.get("private_key"):
-                env_vars[f"DBT_{env_name}_PRIVATE_KEY"] = "<SET_MANUALLY>"
-
-            # Connection-specific variables
-            if connection_type == "snowflake":
-                role = get_field_value("role") or connection.get("role")
-                if role:
-                    env_vars[f"DBT_{env_name}_ROLE"] = role
-            elif connection_type == "bigquery":
-                if project_id:
-                    env_vars[f"DBT_{env_name}_PROJECT"] = project_id
-                # BigQuery uses service account JSON keyfile
-                env_vars[f"DBT_{env_name}_KEYFILE"] = "<SET_MANUALLY>"
-                location = get_field_value("location") or connection.get("location")
-                if location:
-                    env_vars[f"DBT_{env_name}_LOCATION"] = location
-            elif connection_type == "databricks":
-                http_path = get_field_value("http_path") or connection.get("http_path")
-                if http_path:
-                    env_vars[f"DBT_{env_name}_HTTP_PATH"] = http_path
-            elif connection_type == "redshift":
-                # Redshift uses same structure as postgres
-                pass  # Already handled above
-            elif connection_type == "spark" or connection_type == "apache_spark":
-                method = get_field_value("method") or connection.get("method")
-                if method:
-                    env_vars[f"DBT_{env_name}_METHOD"] = method
-            elif connection_type == "athena":
-                s3_staging_dir = get_field_value("s3_staging_dir") or connection.get("s3_staging_dir")
-                region_name = get_field_value("region_name") or connection.get("region_name")
-                if s3_staging_dir:
-                    env_vars[f"DBT_{env_name}_S3_STAGING_DIR"] = s3_staging_dir
-                if region_name:
-                    env_vars[f"DBT_{env_name}_REGION"] = region_name
-            elif connection_type == "trino" or connection_type == "starburst":
-                catalog = get_field_value("catalog") or connection.get("catalog")
-                if catalog:
-                    env_vars[f"DBT_{env_name}_CATALOG"] = catalog
-            elif connection_type == "synapse" or connection_type == "azure_synapse":
-                server = get_field_value("server") or connection.get("server") or host
-                if server:
-                    env_vars[f"DBT_{env_name}_SERVER"] = server
-            elif connection_type == "fabric" or connection_type == "microsoft_fabric":
-                server = get_field_value("server") or connection.get("server") or host
-                if server:
-                    env_vars[f"DBT_{env_name}_SERVER"] = server
-            elif connection_type == "teradata":
-                # Teradata uses standard host/user/database
-                pass  # Already handled above
-            elif connection_type == "alloydb":
-                # AlloyDB uses PostgreSQL structure
-                pass  # Already handled above
-
-        # Extract custom environment variables if available
-        custom_env_vars = env.get("custom_environment_variables", {})
-        if custom_env_vars:
-            for key, value in custom_env_vars.items():
-                env_vars[key] = value
-
-    # Extract job-level environment variables
-    for job in jobs:
-        job_env_vars = job.get("environment_variables", {})
-        if job_env_vars:
-            for key, value in job_env_vars.items():
-                # Use job name as prefix if not already set
-                if key not in env_vars:
-                    env_vars[key] = value
+        _add_environment_variables(env, env_vars)
+    _add_job_environment_variables(jobs, env_vars)
 
     # Add common dbt variables
     # Note: DBT_PROFILES_DIR is not added - Dagster dbt component
     # automatically finds profiles.yml in ~/.dbt (default location)
-
     return env_vars
 
+
+def analyze_environments_and_jobs(
+    environments: List[Dict[str, Any]], jobs: List[Dict[str, Any]]
+) -> Tuple[Set[str], Dict[str, str]]:
+    """
+    Detect required dbt adapters and extract environment variables in one pass
+
+    Equivalent to calling detect_adapters and extract_environment_variables,
+    but walks the environments only once.
+
+    Args:
+        environments: List of dbt Cloud environment dictionaries
+        jobs: List of dbt Cloud job dictionaries
+
+    Returns:
+        Tuple of (required dbt adapter package names, environment variables)
+    """
+    adapters: Set[str] = set()
+    env_vars: Dict[str, str] = {}
+    for env in environments:
+        _add_environment_adapters(env, adapters)
+        _add_environment_variables(env, env_vars)
+    _add_job_environment_variables(jobs, env_vars)
+    return adapters, env_vars
@@ -1,11 +1,31 @@
 """CLI interface for dbt Cloud migration assistant"""
 
 import click
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 from .dbt_cloud_client import DbtCloudClient
 from .git_discovery import discover_git_repo, prompt_for_git_repo, validate_git_url
-from .dagster_generator import DagsterProjectGenerator
-from .adapter_detector import detect_adapters, extract_environment_variables
+from .adapter_detector import analyze_environments_and_jobs
+
+
+def _repository_key(project: Dict[str, Any]) -> tuple:
+    """Key identifying a project's repository, falling back to the project itself"""
+    repository = project.get("repository")
+    repository_id = repository.get("id") if isinstance(repository, dict) else None
+    if repository_id is not None:
+        return ("repository", repository_id)
+    return ("project", project.get("id"))
+
+
+def _discover_project_repo(client: DbtCloudClient, project: Dict[str, Any]) -> Optional[str]:
+    """Discover the git repository URL for a project, falling back to project data only"""
+    try:
+        # Try to get detailed project info and repository connection
+        repo_connection = client.get_repository_connection(project.get("id"))
+        return discover_git_repo(project, repo_connection)
+    except Exception:
+        # If detailed fetch fails, try with just project data
+        return discover_git_repo(project)
 
 
 @click.command()
@@ -48,15 +68,29 @@ from .adapter_detector import detect_adapters, extract_environment_variables
     is_flag=True,
     help="Skip automatic setup (don't clone repos, copy profiles, or install deps)",
 )
-def main(api_key: Optional[str], account_id: Optional[int], output_dir: Optional[str], api_base_url: Optional[str], skip_confirm: bool, auto_setup: bool, no_auto_setup: bool):
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Don't reuse or store cached dbt Cloud API responses (~/.cache/dbt-cloud-migration)",
+)
+@click.option(
+    "--shallow-clone",
+    is_flag=True,
+    help="Clone only the latest commit of each dbt project repository during auto setup",
+)
+@click.option(
+    "--recurse-submodules",
+    is_flag=True,
+    help="Also clone the git submodules of each dbt project repository during auto setup",
+)
+def main(api_key: Optional[str], account_id: Optional[int], output_dir: Optional[str], api_base_url: Optional[str], skip_confirm: bool, auto_setup: bool, no_auto_setup: bool, no_cache: bool, shallow_clone: bool, recurse_submodules: bool):
     """
     Migrate dbt Cloud projects, jobs, and schedules to Dagster.
 
     This tool fetches your dbt Cloud configuration and generates a Dagster
     project with equivalent jobs and schedules.
     """
-    click.echo("🚀 Starting dbt Cloud to Dagster migration...")
-    click.echo("")
+    click.echo("🚀 Starting dbt Cloud to Dagster migration...\n")
 
     # Prompt for required values if not provided
     if not api_key:
@@ -95,184 +129,252 @@ def main(api_key: Optional[str], account_id: Optional[int], output_dir: Optional
     try:
         if api_base_url:
             click.echo(f"Using custom API base URL: {api_base_url}")
-        client = DbtCloudClient(api_key, account_id, base_url=api_base_url)
+        client = DbtCloudClient(api_key, account_id, base_url=api_base_url, use_cache=not no_cache)
         click.echo("✓ Initialized dbt Cloud API client")
-        
-        # Test connection
-        click.echo("🔐 Testing authentication...")
-        if not client.test_connection():
-            click.echo("✗ Authentication failed. Please check:", err=True)
-            click.echo("  - API token is correct and active", err=True)
-            click.echo("  - Account ID is correct (check URL: cloud.getdbt.com/settings/accounts/{ID}/)", err=True)
-            click.echo("  - Service token has proper permissions", err=True)
-            raise click.Abort()
-        click.echo("✓ Authentication successful")
     except Exception as e:
         click.echo(f"✗ Failed to connect to dbt Cloud: {e}", err=True)
         raise click.Abort()
 
-    # Fetch data from dbt Cloud
+    # Fetch data from dbt Cloud. These endpoints are independent, so fetch them
+    # concurrently, and test authentication alongside them rather than paying
+    # for a separate round trip up front.
+    click.echo("🔐 Testing authentication...")
     click.echo("📥 Fetching projects, jobs, and environments...")
-    try:
-        projects = client.get_projects()
-        click.echo(f"  Found {len(projects)} project(s)")
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        auth_future = executor.submit(client.test_connection)
+        projects_future = executor.submit(client.get_projects)
+        jobs_future = executor.submit(client.get_jobs)
+        environments_future = executor.submit(client.get_environments)
 
-        jobs = client.get_jobs()
-        click.echo(f"  Found {len(jobs)} job(s)")
+        if not auth_future.result():
+            click.echo(
+                "\n".join([
+                    "✗ Authentication failed. Please check:",
+                    "  - API token is correct and active",
+                    "  - Account ID is correct (check URL: cloud.getdbt.com/settings/accounts/{ID}/)",
+                    "  - Service token has proper permissions",
+                ]),
+                err=True,
+            )
+            raise click.Abort()
+        click.echo("✓ Authentication successful")
 
-        environments = client.get_environments()
-        click.echo(f"  Found {len(environments)} environment(s)")
-    except Exception as e:
-        click.echo(f"✗ Failed to fetch data: {e}", err=True)
-        raise click.Abort()
+        try:
+            projects = projects_future.result()
+            jobs = jobs_future.result()
+            environments = environments_future.result()
+        except Exception as e:
+            click.echo(f"✗ Failed to fetch data: {e}", err=True)
+            raise click.Abort()
+    click.echo(
+        "\n".join([
+            f"  Found {len(projects)} project(s)",
+            f"  Found {len(jobs)} job(s)",
+            f"  Found {len(environments)} environment(s)",
+        ])
+    )
 
     if not projects:
         click.echo("⚠ No projects found in dbt Cloud", err=True)
         raise click.Abort()
 
     # Discover or prompt for git repositories
-    click.echo("")
-    click.echo("🔍 Discovering git repositories...")
+    click.echo("\n🔍 Discovering git repositories...")
     project_repos: Dict[int, str] = {}
+    # Names of the projects being migrated, in project order
+    migrated_project_names: List[str] = []
+
+    # Projects that share a dbt Cloud repository resolve to the same URL, so
+    # each repository is only discovered once
+    repo_keys = [_repository_key(project) for project in projects]
+    projects_by_repo_key: Dict[tuple, Dict[str, Any]] = {}
+    for repo_key, project in zip(repo_keys, projects):
+        projects_by_repo_key.setdefault(repo_key, project)
+
+    # Repository lookups hit the API once per project, so run them concurrently.
+    # Output and prompts stay on the main thread to preserve ordering.
+    with ThreadPoolExecutor(max_workers=min(16, len(projects_by_repo_key))) as executor:
+        discovered_repos = dict(
+            zip(
+                projects_by_repo_key,
+                executor.map(
+                    lambda project: _discover_project_repo(client, project),
+                    projects_by_repo_key.values(),
+                ),
+            )
+        )
 
-    for project in projects:
+    # Found repositories are buffered and echoed together; the buffer is
+    # flushed before any prompt or warning so the output stays in order
+    lines = []
+    for repo_key, project in zip(repo_keys, projects):
         project_id = project.get("id")
         project_name = project.get("name", f"project_{project_id}")
-        
-        # Try to get detailed project info and repository connection
-        repo_url = None
-        try:
-            repo_connection = client.get_repository_connection(project_id)
-            repo_url = discover_git_repo(project, repo_connection)
-        except Exception:
-            # If detailed fetch fails, try with just project data
-            repo_url = discover_git_repo(project)
+        repo_url = discovered_repos[repo_key]
         
         if repo_url:
             project_repos[project_id] = repo_url
-            click.echo(f"  ✓ Found repository for {project_name}: {repo_url}")
+            migrated_project_names.append(project_name)
+            lines.append(f"  ✓ Found repository for {project_name}: {repo_url}")
+            continue
+
+        if lines:
+            click.echo("\n".join(lines))
+            lines = []
+        # Prompt user if not found
+        if not skip_confirm:
+            repo_url = prompt_for_git_repo(project_name, project_id)
+            project_repos[project_id] = repo_url
+            migrated_project_names.append(project_name)
         else:
-            # Prompt user if not found
-            if not skip_confirm:
-                repo_url = prompt_for_git_repo(project_name, project_id)
-                project_repos[project_id] = repo_url
-            else:
-                click.echo(
-                    f"  ⚠ No repository found for {project_name}, skipping...", err=True
-                )
+            click.echo(
+                f"  ⚠ No repository found for {project_name}, skipping...", err=True
+            )
+    if lines:
+        click.echo("\n".join(lines))
 
     if not project_repos:
         click.echo("✗ No git repositories configured", err=True)
         raise click.Abort()
 
     # Detect adapters and environment variables
-    click.echo("")
-    click.echo("🔍 Analyzing environments for dbt adapters and configuration...")
-    required_adapters = detect_adapters(environments)
+    lines = ["", "🔍 Analyzing environments for dbt adapters and configuration..."]
+    required_adapters, env_vars = analyze_environments_and_jobs(environments, jobs)
+    adapters_csv = ", ".join(sorted(required_adapters))
     if required_adapters:
-        click.echo(f"  Detected dbt adapters: {', '.join(sorted(required_adapters))}")
+        lines.append(f"  Detected dbt adapters: {adapters_csv}")
     else:
-        click.echo("  ⚠ No dbt adapters detected (will use dbt-core only)")
+        lines.append("  ⚠ No dbt adapters detected (will use dbt-core only)")
     
-    env_vars = extract_environment_variables(environments, jobs)
     if env_vars:
-        click.echo(f"  Found {len(env_vars)} environment variable(s) to configure")
+        lines.append(f"  Found {len(env_vars)} environment variable(s) to configure")
+    click.echo("\n".join(lines))
 
     # Generate Dagster project
-    click.echo("")
-    click.echo(f"📦 Generating Dagster project in '{output_dir}'...")
-    click.echo("  Using Dagster 1.12+ CLI (dg) for project scaffolding...")
-    click.echo("  - Scaffolding dbt components with 'dg scaffold defs'")
-    click.echo("  - Registering custom job/schedule components with 'dg scaffold component'")
+    click.echo(
+        "\n".join([
+            "",
+            f"📦 Generating Dagster project in '{output_dir}'...",
+            "  Using Dagster 1.12+ CLI (dg) for project scaffolding...",
+            "  - Scaffolding dbt components with 'dg scaffold defs'",
+            "  - Registering custom job/schedule components",
+        ])
+    )
     try:
-        generator = DagsterProjectGenerator(output_dir)
+        # Imported lazily so startup and the API fetches don't pay for it
+        from .dagster_generator import DagsterProjectGenerator
+
+        generator = DagsterProjectGenerator(
+            output_dir,
+            shallow_clones=shallow_clone,
+            clone_submodules=recurse_submodules,
+        )
         generator.generate_project(projects, jobs, environments, project_repos)
         click.echo("✓ Dagster project generated successfully using Dagster CLI")
     except Exception as e:
-        click.echo(f"✗ Failed to generate project: {e}", err=True)
-        click.echo("  Make sure Dagster 1.12+ is installed: pip install 'dagster[cli]>=1.12.0'", err=True)
+        click.echo(
+            f"✗ Failed to generate project: {e}\n"
+            "  Make sure Dagster 1.12+ is installed: pip install 'dagster[cli]>=1.12.0'",
+            err=True,
+        )
         raise click.Abort()
 
     # Apply auto-setup (default behavior, unless --no-auto-setup is used)
-    if auto_setup and not no_auto_setup:
-        click.echo("")
-        click.echo("📥 Cloning dbt project repositories...")
-        try:
-            for project in projects:
-                project_id = project.get("id")
-                if project_id not in project_repos:
-                    continue
-                project_name = project.get("name", f"project_{project_id}")
-                click.echo(f"  Cloning {project_name}...")
-            generator.clone_repositories(projects, project_repos)
-            click.echo("✓ All repositories cloned successfully")
-        except Exception as e:
-            click.echo(f"⚠ Failed to clone repositories: {e}", err=True)
-            click.echo("  You can run './clone_dbt_projects.sh' manually later", err=True)
+    ran_auto_setup = auto_setup and not no_auto_setup
+    if ran_auto_setup:
+        # Installing dependencies is dominated by package downloads and doesn't
+        # need the cloned repositories, so it runs in the background while they
+        # are cloned. Manifests are generated last since dbt parse needs both
+        # the installed adapters and profiles.yml.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            install_future = executor.submit(generator.install_dependencies)
+
+            lines = ["", "📥 Cloning dbt project repositories..."]
+            lines.extend(f"  Cloning {project_name}..." for project_name in migrated_project_names)
+            click.echo("\n".join(lines))
+            try:
+                generator.clone_repositories(projects, project_repos)
+                click.echo("✓ All repositories cloned successfully")
+            except Exception as e:
+                click.echo(
+                    f"⚠ Failed to clone repositories: {e}\n"
+                    "  You can run './clone_dbt_projects.sh' manually later",
+                    err=True,
+                )
+            
+            click.echo("\n📋 Copying profiles.yml...")
+            try:
+                generator.copy_profiles_yml()
+                click.echo("✓ profiles.yml copied to ~/.dbt/profiles.yml")
+                click.echo("  ⚠ Remember to update credentials in ~/.dbt/profiles.yml", err=True)
+            except Exception as e:
+                click.echo(
+                    f"⚠ Failed to copy profiles.yml: {e}\n"
+                    "  You can copy 'profiles.yml.template' to '~/.dbt/profiles.yml' manually",
+                    err=True,
+                )
+            
+            click.echo("\n📦 Installing dependencies...")
+            try:
+                install_future.result()
+                click.echo("✓ Dependencies installed successfully")
+            except Exception as e:
+                click.echo(
+                    f"⚠ Failed to install dependencies: {e}\n"
+                    f"  You can run 'cd {output_dir} && pip install -e .' manually",
+                    err=True,
+                )
         
-        click.echo("")
-        click.echo("📦 Generating dbt manifests...")
+        lines = ["", "📦 Generating dbt manifests..."]
+        lines.extend(f"  Generating manifest for {project_name}..." for project_name in migrated_project_names)
+        click.echo("\n".join(lines))
         try:
-            for project in projects:
-                project_id = project.get("id")
-                if project_id not in project_repos:
-                    continue
-                project_name = project.get("name", f"project_{project_id}")
-                click.echo(f"  Generating manifest for {project_name}...")
             generator.generate_dbt_manifests(projects, project_repos)
             click.echo("✓ All dbt manifests generated successfully")
         except Exception as e:
-            click.echo(f"⚠ Failed to generate dbt manifests: {e}", err=True)
-            click.echo("  You can run 'dbt parse' in each dbt project directory manually", err=True)
-        
-        click.echo("")
-        click.echo("📋 Copying profiles.yml...")
-        try:
-            generator.copy_profiles_yml()
-            click.echo("✓ profiles.yml copied to ~/.dbt/profiles.yml")
-            click.echo("  ⚠ Remember to update credentials in ~/.dbt/profiles.yml", err=True)
-        except Exception as e:
-            click.echo(f"⚠ Failed to copy profiles.yml: {e}", err=True)
-            click.echo("  You can copy 'profiles.yml.template' to '~/.dbt/profiles.yml' manually", err=True)
-        
-        click.echo("")
-        click.echo("📦 Installing dependencies...")
-        try:
-            generator.install_dependencies()
-            click.echo("✓ Dependencies installed successfully")
-        except Exception as e:
-            click.echo(f"⚠ Failed to install dependencies: {e}", err=True)
-            click.echo(f"  You can run 'cd {output_dir} && pip install -e .' manually", err=True)
+            click.echo(
+                f"⚠ Failed to generate dbt manifests: {e}\n"
+                "  You can run 'dbt parse' in each dbt project directory manually",
+                err=True,
+            )
 
     # Summary
-    click.echo("")
-    click.echo("✅ Migration complete!")
-    click.echo("")
-    click.echo("📄 Migration Summary: See MIGRATION_SUMMARY.md for details")
-    click.echo("")
+    lines = [
+        "",
+        "✅ Migration complete!",
+        "",
+        "📄 Migration Summary: See MIGRATION_SUMMARY.md for details",
+        "",
+        "Next steps:",
+    ]
     
-    # Show next steps
-    if no_auto_setup:
-        click.echo("Next steps:")
-        click.echo(f"  1. Run './clone_dbt_projects.sh' to clone all dbt project repositories")
-        click.echo("  2. Copy 'profiles.yml.template' to '~/.dbt/profiles.yml' and update credentials")
-        if required_adapters:
-            click.echo(f"  3. Install dependencies (includes adapters: {', '.join(sorted(required_adapters))}):")
-        else:
-            click.echo("  3. Install dependencies:")
-        click.echo(f"     cd {output_dir} && pip install -e .")
-        click.echo(f"  4. Start Dagster: cd {output_dir} && dg dev")
-    else:
-        click.echo("Next steps:")
-        click.echo(f"  1. Review the generated project in '{output_dir}/'")
-        click.echo("  2. Update the .env file with your database credentials (if needed)")
-        click.echo("  3. Update credentials in ~/.dbt/profiles.yml")
-        click.echo(f"  4. Run './validate_migration.sh' to validate the migration")
-        click.echo(f"  5. Start Dagster: cd {output_dir} && dg dev")
+    # Show next steps, numbered in order; manual setup steps are only needed
+    # when auto-setup was skipped
+    install_step = (
+        f"Install dependencies (includes adapters: {adapters_csv}):"
+        if required_adapters
+        else "Install dependencies:"
+    )
+    next_steps = [
+        step
+        for needed, step in (
+            (not ran_auto_setup, "Run './clone_dbt_projects.sh' to clone all dbt project repositories"),
+            (not ran_auto_setup, "Copy 'profiles.yml.template' to '~/.dbt/profiles.yml' and update credentials"),
+            (not ran_auto_setup, f"{install_step}\n     cd {output_dir} && pip install -e ."),
+            (ran_auto_setup, f"Review the generated project in '{output_dir}/'"),
+            (ran_auto_setup, "Update the .env file with your database credentials (if needed)"),
+            (ran_auto_setup, "Update credentials in ~/.dbt/profiles.yml"),
+            (ran_auto_setup, "Run './validate_migration.sh' to validate the migration"),
+            (True, f"Start Dagster: cd {output_dir} && dg dev"),
+        )
+        if needed
+    ]
+    lines.extend(f"  {number}. {step}" for number, step in enumerate(next_steps, 1))
     
-    click.echo("")
-    click.echo("Note: All definitions are component-based YAML (no Python code generation!)")
-    click.echo("      Jobs and schedules use custom components in defs/jobs/ and defs/schedules/")
+    lines.append("")
+    lines.append("Note: All definitions are component-based YAML (no Python code generation!)")
+    lines.append("      Jobs and schedules use custom components in defs/jobs/ and defs/schedules/")
+    click.echo("\n".join(lines))
 
 
 if __name__ == "__main__":
@@ -1,12 +1,20 @@
 """Custom Dagster components for jobs, schedules, and sensors."""
 
-from .job import JobComponent
-from .schedule import ScheduleComponent
-from .sensor import SensorComponent
+import importlib
 
-__all__ = [
-    "JobComponent",
-    "ScheduleComponent",
-    "SensorComponent",
-]
+# Components are imported lazily so that importing this package doesn't load
+# dagster until a component class is actually accessed
+_COMPONENT_MODULES = {
+    "DbtCloudJobComponent": ".job",
+    "DbtCloudScheduleComponent": ".schedule",
+    "DbtCloudSensorComponent": ".sensor",
+}
 
+__all__ = list(_COMPONENT_MODULES)
+
+
+def __getattr__(name: str):
+    if name in _COMPONENT_MODULES:
+        module = importlib.import_module(_COMPONENT_MODULES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
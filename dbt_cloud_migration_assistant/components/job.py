@@ -1,12 +1,39 @@
 """dbt Cloud Job component for Dagster - creates jobs from dbt Cloud job definitions."""
 
-from typing import Optional, Any
-from pydantic import field_validator
+import functools
+from typing import Annotated, Optional, Any
+from pydantic import BeforeValidator
 
 import dagster as dg
 from dagster._core.definitions.asset_selection import AssetSelection
 
 
+@functools.lru_cache(maxsize=4096)
+def _parse_key(key_str: str) -> dg.AssetKey:
+    """Parse a key like "my_model" or multi-part "path/to/asset" into an AssetKey."""
+    # Most dbt asset keys are a single part, which partition handles without a split
+    head, sep, tail = key_str.partition("/")
+    return dg.AssetKey([head, *tail.split("/")] if sep else [head])
+
+
+@functools.lru_cache(maxsize=1024)
+def _make_selection(asset_selection: tuple[str, ...]) -> AssetSelection:
+    """Build the asset selection for a job (cached, as jobs often repeat selections)."""
+    # Patterns like "analytics.*" select all assets (dbt components create assets
+    # without a prefix), which subsumes any individually listed keys
+    if any(key_str.endswith(".*") for key_str in asset_selection):
+        return AssetSelection.all()
+    # Individual keys like "my_model" select specific assets, as one flat selection
+    return AssetSelection.keys(*(_parse_key(key_str) for key_str in asset_selection))
+
+
+def _stringify_tag_values(v: Any) -> Any:
+    """Convert all tag values to strings (YAML may parse numbers as ints)."""
+    if isinstance(v, dict):
+        return {k: val if isinstance(val, str) else str(val) for k, val in v.items()}
+    return v
+
+
 class DbtCloudJobComponent(dg.Component, dg.Model, dg.Resolvable):
     """Component for creating Dagster jobs from dbt Cloud job definitions.
     
@@ -17,47 +44,12 @@ class DbtCloudJobComponent(dg.Component, dg.Model, dg.Resolvable):
     job_name: str
     asset_selection: list[str]
     description: Optional[str] = None
-    tags: Optional[dict[str, str]] = None
+    tags: Annotated[Optional[dict[str, str]], BeforeValidator(_stringify_tag_values)] = None
     config: Optional[dict] = None
-    
-    @field_validator('tags', mode='before')
-    @classmethod
-    def convert_tag_values_to_strings(cls, v: Any) -> Optional[dict[str, str]]:
-        """Convert all tag values to strings (YAML may parse numbers as ints)."""
-        if v is None:
-            return None
-        if isinstance(v, dict):
-            return {k: str(val) for k, val in v.items()}
-        return v
 
     def build_defs(self, context: dg.ComponentLoadContext) -> dg.Definitions:
         """Build Dagster definitions from component parameters."""
-        # Handle asset selection patterns
-        # Patterns like "analytics.*" should select all assets
-        # Individual keys like "my_model" should select specific assets
-        asset_selections = []
-        
-        for key_str in self.asset_selection:
-            if key_str.endswith(".*"):
-                # Wildcard pattern - select all assets (dbt components create assets without prefix)
-                # Use AssetSelection.all() for wildcard patterns
-                asset_selections.append(AssetSelection.all())
-            elif "/" in key_str:
-                # Multi-part key like "path/to/asset"
-                parts = key_str.split("/")
-                asset_selections.append(AssetSelection.keys(dg.AssetKey(parts)))
-            else:
-                # Single-part key like "my_model"
-                asset_selections.append(AssetSelection.keys(dg.AssetKey([key_str])))
-        
-        # Combine all selections
-        if len(asset_selections) == 1:
-            asset_sel = asset_selections[0]
-        else:
-            # Union of all selections
-            asset_sel = asset_selections[0]
-            for sel in asset_selections[1:]:
-                asset_sel = asset_sel | sel
+        asset_sel = _make_selection(tuple(self.asset_selection))
 
         # Create job
         job = dg.define_asset_job(
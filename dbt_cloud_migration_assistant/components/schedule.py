@@ -5,6 +5,12 @@ from typing import Optional
 import dagster as dg
 from dagster._core.definitions.asset_selection import AssetSelection
 
+# String values accepted in defs.yaml, mapped to their Dagster enums
+_DEFAULT_SCHEDULE_STATUSES = {
+    "RUNNING": dg.DefaultScheduleStatus.RUNNING,
+    "STOPPED": dg.DefaultScheduleStatus.STOPPED,
+}
+
 
 class DbtCloudScheduleComponent(dg.Component, dg.Model, dg.Resolvable):
     """Component for creating Dagster schedules from dbt Cloud schedule definitions.
@@ -49,10 +55,8 @@ class DbtCloudScheduleComponent(dg.Component, dg.Model, dg.Resolvable):
             job_name=target if isinstance(target, str) else target.name,
             execution_timezone=self.timezone,
             description=self.description,
-            default_status=(
-                dg.DefaultScheduleStatus.RUNNING
-                if self.default_status == "RUNNING"
-                else dg.DefaultScheduleStatus.STOPPED
+            default_status=_DEFAULT_SCHEDULE_STATUSES.get(
+                self.default_status, dg.DefaultScheduleStatus.STOPPED
             ),
         )
 
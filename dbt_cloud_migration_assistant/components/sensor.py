@@ -4,6 +4,18 @@ from typing import Optional, Literal
 
 import dagster as dg
 
+# String values accepted in defs.yaml, mapped to their Dagster enums
+_DEFAULT_SENSOR_STATUSES = {
+    "RUNNING": dg.DefaultSensorStatus.RUNNING,
+    "STOPPED": dg.DefaultSensorStatus.STOPPED,
+}
+_RUN_STATUSES = {
+    "SUCCESS": dg.DagsterRunStatus.SUCCESS,
+    "FAILURE": dg.DagsterRunStatus.FAILURE,
+    "CANCELED": dg.DagsterRunStatus.CANCELED,
+    "STARTED": dg.DagsterRunStatus.STARTED,
+}
+
 
 class DbtCloudSensorComponent(dg.Component, dg.Model, dg.Resolvable):
     """Component for creating Dagster sensors from dbt Cloud job completion triggers.
@@ -36,6 +48,10 @@ class DbtCloudSensorComponent(dg.Component, dg.Model, dg.Resolvable):
 
         return dg.Definitions(sensors=[sensor_def])
 
+    def _default_sensor_status(self) -> dg.DefaultSensorStatus:
+        """Map the default_status string to DefaultSensorStatus (STOPPED unless RUNNING)."""
+        return _DEFAULT_SENSOR_STATUSES.get(self.default_status, dg.DefaultSensorStatus.STOPPED)
+
     def _create_file_sensor(self):
         """Create a file-watching sensor."""
         from pathlib import Path
@@ -48,11 +64,7 @@ class DbtCloudSensorComponent(dg.Component, dg.Model, dg.Resolvable):
             job_name=job_name,
             minimum_interval_seconds=self.minimum_interval_seconds,
             description=self.description or f"Watch for file: {file_path}",
-            default_status=(
-                dg.DefaultSensorStatus.RUNNING
-                if self.default_status == "RUNNING"
-                else dg.DefaultSensorStatus.STOPPED
-            ),
+            default_status=self._default_sensor_status(),
         )
         def file_sensor(context: dg.SensorEvaluationContext):
             """Sensor that triggers when a file exists."""
@@ -65,13 +77,7 @@ class DbtCloudSensorComponent(dg.Component, dg.Model, dg.Resolvable):
     def _create_run_status_sensor(self):
         """Create a run status sensor that monitors another job's run status."""
         # Map string status to DagsterRunStatus enum
-        status_map = {
-            "SUCCESS": dg.DagsterRunStatus.SUCCESS,
-            "FAILURE": dg.DagsterRunStatus.FAILURE,
-            "CANCELED": dg.DagsterRunStatus.CANCELED,
-            "STARTED": dg.DagsterRunStatus.STARTED,
-        }
-        dagster_status = status_map.get(self.run_status, dg.DagsterRunStatus.SUCCESS)
+        dagster_status = _RUN_STATUSES.get(self.run_status, dg.DagsterRunStatus.SUCCESS)
         
         # Store monitored_job_name and job_to_trigger for use in the sensor function
         monitored_job = self.monitored_job_name
@@ -86,11 +92,7 @@ class DbtCloudSensorComponent(dg.Component, dg.Model, dg.Resolvable):
             "run_status": dagster_status,
             "description": self.description or f"Monitor {monitored_job} for {self.run_status} and trigger {job_to_trigger}",
             "minimum_interval_seconds": self.minimum_interval_seconds,
-            "default_status": (
-                dg.DefaultSensorStatus.RUNNING
-                if self.default_status == "RUNNING"
-                else dg.DefaultSensorStatus.STOPPED
-            ),
+            "default_status": self._default_sensor_status(),
         }
         
         @dg.run_status_sensor(**sensor_params)
@@ -126,11 +128,7 @@ class DbtCloudSensorComponent(dg.Component, dg.Model, dg.Resolvable):
             job_name=self.job_name,
             minimum_interval_seconds=self.minimum_interval_seconds,
             description=self.description or f"Monitor asset: {self.asset_key}",
-            default_status=(
-                dg.DefaultSensorStatus.RUNNING
-                if self.default_status == "RUNNING"
-                else dg.DefaultSensorStatus.STOPPED
-            ),
+            default_status=self._default_sensor_status(),
         )
         def asset_sensor_fn(context: dg.SensorEvaluationContext, asset_event: dg.EventLogEntry):
             """Sensor that triggers when the monitored asset is materialized."""
@@ -148,11 +146,7 @@ class DbtCloudSensorComponent(dg.Component, dg.Model, dg.Resolvable):
             job_name=self.job_name,
             minimum_interval_seconds=self.minimum_interval_seconds,
             description=self.description or "Custom sensor",
-            default_status=(
-                dg.DefaultSensorStatus.RUNNING
-                if self.default_status == "RUNNING"
-                else dg.DefaultSensorStatus.STOPPED
-            ),
+            default_status=self._default_sensor_status(),
         )
         def custom_sensor(context: dg.SensorEvaluationContext):
             """Custom sensor - modify this logic as needed."""
@@ -1,27 +1,394 @@
 """Generate Dagster project structure from dbt Cloud configuration using Dagster CLI"""
 
+import functools
 import os
+import re
 import subprocess
 import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Set
+import tomlkit
 import yaml
-from .adapter_detector import detect_adapters, extract_environment_variables
+from .adapter_detector import analyze_environments_and_jobs
 from .profiles_generator import generate_profiles_yml
 
 
+# Use the libyaml-backed dumper when available; it is much faster when
+# writing a defs.yaml file for every job, schedule and sensor
+_SafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+class _TagStringDumper(_SafeDumper):
+    """YAML dumper that writes ints as strings, so job tag values stay strings"""
+
+    def represent_str(self, data):
+        return self.represent_scalar('tag:yaml.org,2002:str', str(data))
+
+
+_TagStringDumper.add_representer(int, _TagStringDumper.represent_str)
+
+# yaml.dump options shared by every generated defs.yaml (block style, keys in
+# insertion order, UTF-8 bytes)
+_DEFS_YAML_OPTIONS = {"encoding": "utf-8", "default_flow_style": False, "sort_keys": False}
+
+# dbt Cloud run status codes (as used in job completion triggers) mapped to
+# Dagster run statuses: 1=Queued, 2=Started, 3=Running, 10=Success, 20=Error, 30=Cancelled
+_DBT_CLOUD_RUN_STATUSES = {
+    10: "SUCCESS",   # Success
+    20: "FAILURE",   # Error
+    30: "CANCELED",  # Cancelled
+    2: "STARTED",    # Started
+    1: "QUEUED",     # Queued (not directly supported in Dagster, but we can map it)
+    3: "STARTED",    # Running (map to STARTED)
+}
+
+# Status codes a completion trigger is treated as watching when it lists none
+# (or at least as many): Success, Error, Cancelled, Started
+_ALL_TRIGGER_STATUSES = (10, 20, 30, 2)
+
+# Wording used for each Dagster run status in sensor descriptions
+_RUN_STATUS_DESCRIPTIONS = {
+    "SUCCESS": "success",
+    "FAILURE": "failure/error",
+    "CANCELED": "cancellation",
+    "STARTED": "start",
+}
+
+# Flags whose arguments are dbt node selectors
+_DBT_SELECT_FLAGS = ('--select', '--models')
+
+# dbt selectors that can't be mapped to asset keys (tag, path and config selection)
+_UNMAPPABLE_SELECTOR_PREFIXES = ('tag:', 'path:', 'config.')
+
+# Selector prefixes that never name a model, including dbt set operators
+_NON_MODEL_PREFIXES = _UNMAPPABLE_SELECTOR_PREFIXES + ('@', '&')
+
+# Project name written to pyproject.toml files created by the generator
+_DEFAULT_PROJECT_NAME = "dagster-dbt-migration"
+
+# Characters replaced with underscores when sanitizing names for paths and identifiers
+_SANITIZE_TABLE = str.maketrans({"-": "_", " ": "_", ".": "_"})
+
+
+def _run_quiet(args: List[str], **kwargs):
+    """
+    Run a command whose output isn't needed
+
+    stdout is discarded and stderr is only decoded if the command fails, in
+    which case the raised CalledProcessError carries it as text.
+    """
+    try:
+        subprocess.run(args, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True, **kwargs)
+    except subprocess.CalledProcessError as e:
+        if e.stderr is not None:
+            e.stderr = e.stderr.decode("utf-8", "replace")
+        raise
+
+
+def _dir_has_entries(path: Path) -> bool:
+    """Check whether a directory exists and is not empty, stopping at the first entry"""
+    try:
+        with os.scandir(path) as entries:
+            return next(entries, None) is not None
+    except FileNotFoundError:
+        return False
+
+
+def _write_text(path: Path, text: str):
+    """
+    Write text to a file as UTF-8 with a single write
+
+    The generated files contain non-ASCII characters (emoji in the Markdown),
+    so the encoding is explicit rather than the platform default.
+    """
+    with open(path, "wb") as f:
+        f.write(text.encode("utf-8"))
+
+
+def _dependency_name(requirement: str) -> str:
+    """Strip the >= or == version pin from a dependency string"""
+    return requirement.split('>=')[0].split('==')[0]
+
+
+def _dbt_selection_args(step: str) -> List[str]:
+    """
+    Get the arguments of the first --select/--models flag in a dbt command
+
+    Arguments run until the next "--" flag or the end of the command. A flag
+    whose arguments are empty or contain a hyphen is skipped in favour of a
+    later one, as those can't be told apart from other flags.
+    """
+    tokens = step.split()
+    for i, token in enumerate(tokens):
+        # Match the flag even when glued to a preceding word, as in "run--select"
+        if not token.endswith(_DBT_SELECT_FLAGS):
+            continue
+        args = []
+        for arg in tokens[i + 1:]:
+            if arg.startswith('--'):
+                break
+            args.append(arg)
+        if args and not any('-' in arg for arg in args):
+            return args
+    return []
+
+
+try:
+    import tomllib
+
+    def _read_project_name(pyproject_path: Path) -> Optional[str]:
+        """Read the project name from a pyproject.toml file"""
+        with open(pyproject_path, "rb") as f:
+            data = tomllib.load(f)
+        project = data.get("project", {})
+        name = project.get("name", "dagster_dbt_migration") if isinstance(project, dict) else None
+        return name if isinstance(name, str) else None
+
+except ImportError:
+    # Python 3.10 has no tomllib, so fall back to a simple regex
+    _PYPROJECT_NAME_RE = re.compile(r'name\s*=\s*"([^"]+)"')
+
+    def _read_project_name(pyproject_path: Path) -> Optional[str]:
+        """Read the project name from a pyproject.toml file"""
+        with open(pyproject_path, "r") as f:
+            match = _PYPROJECT_NAME_RE.search(f.read())
+        return match.group(1) if match else None
+
+
+def _parse_dbt_project(project_dir: Path):
+    """Generate target/manifest.json for a dbt project, which Dagster needs"""
+    # Run dbt parse to generate manifest.json
+    try:
+        _run_quiet(["dbt", "parse"], cwd=project_dir)
+    except subprocess.CalledProcessError:
+        # If dbt parse fails, try dbt compile as fallback
+        try:
+            _run_quiet(["dbt", "compile"], cwd=project_dir)
+        except subprocess.CalledProcessError:
+            # If both fail, continue - user can run manually
+            pass
+
+
+# Header of profiles.yml.template, explaining how to use the generated profiles
+_PROFILES_TEMPLATE_HEADER = """# Template dbt profiles.yml
+# Copy this to ~/.dbt/profiles.yml and update with your credentials
+# 
+# Default Target: 'local' (DuckDB) for local development
+#   - DuckDB database will be created at the path specified in DBT_DUCKDB_PATH
+#   - No additional setup needed for local development
+# 
+# Deployment-Aware Configuration:
+#   The dbt components are ALREADY configured with deployment-aware target selection!
+#   They use DAGSTER_CLOUD_DEPLOYMENT_NAME to automatically select the right target.
+#   
+#   To make profiles.yml match this behavior, update the 'target' field:
+#     target: "{{ env_var('DAGSTER_CLOUD_DEPLOYMENT_NAME', 'local') }}"
+#   
+#   This matches the pattern from the Dagster demo project:
+#   https://github.com/dagster-io/hooli-data-eng-pipelines/blob/master/hooli-data-eng/src/hooli_data_eng/defs/dbt/resources.py
+# 
+# See MIGRATION_SUMMARY.md for more details.
+
+"""
+
+# Static sections of MIGRATION_SUMMARY.md: the manual steps that always apply,
+# and the closing guide on deployment-aware configuration and next steps
+_SUMMARY_MANUAL_STEPS = """## ⚠️ Warnings and Manual Steps
+
+### Alerts/Notifications
+**⚠️ Alerts and notifications from dbt Cloud were NOT migrated.**
+
+You will need to manually configure alerts in Dagster:
+- For Dagster Cloud: Use the Alerts feature in the Dagster+ UI
+- For OSS: Configure alerting through your monitoring system
+- Review your dbt Cloud notification settings and recreate them in Dagster
+
+### Environment Variables
+**Action Required:** Review and update the `.env` file with your actual credentials.
+
+- Update any placeholders marked with `<SET_MANUALLY>`
+- Verify all database connection details
+- For Dagster Cloud: Set these in the Dagster+ UI or agent config
+
+### dbt Profiles
+**Action Required:** Copy `profiles.yml.template` to `~/.dbt/profiles.yml` and update credentials.
+
+- A local DuckDB target has been added for local development
+- Use `dbt_target=local` for local development
+- Update production targets with actual credentials
+
+"""
+
+_SUMMARY_DEPLOYMENT_GUIDE = """## 🌍 Deployment-Aware Configuration
+
+This migration is configured to be deployment-aware using Dagster Cloud environment variables.
+
+### Available Environment Variables
+
+Dagster Cloud provides built-in environment variables that you can use:
+
+| Variable | Description |
+|----------|-------------|
+| `DAGSTER_CLOUD_DEPLOYMENT_NAME` | The name of the Dagster+ deployment (e.g., `prod`, `staging`) |
+| `DAGSTER_CLOUD_IS_BRANCH_DEPLOYMENT` | `1` if the deployment is a branch deployment |
+| `DAGSTER_CLOUD_GIT_BRANCH` | The git branch name (branch deployments only) |
+| `DAGSTER_CLOUD_GIT_SHA` | The commit SHA (branch deployments only) |
+
+### Usage Examples
+
+#### 1. Deployment-Aware Target Selection in profiles.yml
+
+Update the `target` field in your profiles.yml to select the right target based on deployment:
+
+```yaml
+default:
+  outputs:
+    local:
+      type: duckdb
+      # ... local config
+    prod:
+      type: snowflake
+      # ... prod config
+  # Deployment-aware target selection:
+  target: "{{ env_var('DAGSTER_CLOUD_DEPLOYMENT_NAME', 'local') }}"
+```
+
+#### 2. Deployment-Aware Target in dbt Component Configuration
+
+In `defs/<project_name>/defs.yaml`, you can add target selection:
+
+```yaml
+- type: dagster_dbt.DbtProjectComponent
+  attributes:
+    project: "{{ project_root }}/dbt_projects/my_project"
+    # Add target selection here:
+    target: "{{ env_var('DAGSTER_CLOUD_DEPLOYMENT_NAME', 'local') }}"
+```
+
+#### 3. Conditional Logic in Python Components
+
+```python
+import os
+deployment = os.getenv('DAGSTER_CLOUD_DEPLOYMENT_NAME', 'local')
+if deployment == 'prod':
+    target = 'prod'
+elif deployment in ['staging', 'dev']:
+    target = 'staging'
+else:
+    target = 'local'  # Default to DuckDB for local development
+```
+
+### How Target Selection Works
+
+The migration tool automatically configures deployment-aware target selection:
+
+1. **Local Development**: When `DAGSTER_CLOUD_DEPLOYMENT_NAME` is not set or is 'local', uses `local` target (DuckDB)
+2. **Deployments**: When deployed to Dagster Cloud, uses the deployment name as the target
+   - If deployment is 'prod', uses `prod` target from profiles.yml
+   - If deployment is 'staging', uses `staging` target from profiles.yml
+
+This matches the pattern used in the [Dagster demo project](https://github.com/dagster-io/hooli-data-eng-pipelines/blob/master/hooli-data-eng/src/hooli_data_eng/defs/dbt/resources.py).
+
+**No additional configuration needed!** The dbt components are already set up to use the right target based on your deployment.
+
+### ⚠️ Environment-Specific Jobs (STG vs PROD)
+
+**Important**: In dbt Cloud, you may have separate jobs for different environments (e.g., STG and PROD).
+
+**Dagster Pattern**: In Dagster, the recommended pattern is to have **one job definition** that works across all deployments, using deployment-aware target selection:
+
+```yaml
+# Single job that works in all deployments
+type: dagster_dbt_migration.components.job.DbtCloudJobComponent
+attributes:
+  job_name: analytics_job
+  asset_selection:
+    - analytics.*
+  tags:
+    # Target is selected automatically based on deployment
+    dbt_target: "{{ env_var('DAGSTER_CLOUD_DEPLOYMENT_NAME', 'local') }}"
+```
+
+**Current Migration**: The migration tool preserves your dbt Cloud structure by creating separate jobs for each environment:
+
+- Jobs tagged with `dbt_target: stg` use the STG environment target
+- Jobs tagged with `dbt_target: prod` use the PROD environment target
+- This preserves your existing workflow but is different from typical Dagster patterns
+
+**Recommendation**: After migration, consider consolidating jobs that do the same thing but target different environments:
+
+1. **Option A - Keep Separate Jobs** (Current): Preserves dbt Cloud structure, easier migration
+   - Pros: Matches your dbt Cloud setup exactly
+   - Cons: More jobs to manage, not typical Dagster pattern
+
+2. **Option B - Consolidate Jobs** (Recommended for Dagster): One job per logical workflow
+   - Pros: Cleaner, follows Dagster best practices, easier to maintain
+   - Cons: Requires manual consolidation after migration
+   - How: Merge jobs with same name but different environments, use deployment-aware targets
+
+**To Consolidate**: After reviewing the migration, you can manually merge jobs by:
+1. Keeping one job definition (e.g., `analytics_new_job`)
+2. Removing environment-specific duplicates
+3. Updating the dbt component to use deployment-aware target selection
+4. The dbt component will automatically use the right target based on `DAGSTER_CLOUD_DEPLOYMENT_NAME`
+
+## 📋 Next Steps
+
+1. **Review this summary** - Verify all projects, jobs, and environments were migrated correctly
+2. **Update credentials** - Review and update `.env` file with actual credentials
+3. **Configure profiles** - Copy `profiles.yml.template` to `~/.dbt/profiles.yml`
+4. **Clone repositories** - Run `./clone_dbt_projects.sh` to clone all dbt projects
+5. **Validate migration** - Run `./validate_migration.sh` to check setup
+6. **Configure alerts** - Manually set up alerts in Dagster (see warnings above)
+7. **Test locally** - Use `dbt_target=local` for local development with DuckDB
+8. **Deploy** - Deploy to Dagster Cloud and configure deployment-specific settings
+9. **Start Dagster** - Run `dg dev` to start the Dagster UI
+
+## ✅ Automatic Features
+
+- **dbt Tests → Asset Checks**: dbt tests are automatically converted to Dagster asset checks by `dagster-dbt`
+- **Asset Dependencies**: dbt model dependencies are automatically mapped to Dagster asset dependencies
+- **Component-Based**: All definitions use Dagster's component system (no Python code generation)
+
+"""
+
+
 class DagsterProjectGenerator:
     """Generates Dagster project structure from dbt Cloud data using Dagster CLI"""
 
-    def __init__(self, output_dir: str = "dagster_project"):
+    def __init__(
+        self,
+        output_dir: str = "dagster_project",
+        max_clone_workers: int = 8,
+        shallow_clones: bool = False,
+        clone_submodules: bool = False,
+    ):
         """
         Initialize generator
 
         Args:
             output_dir: Directory where Dagster project will be created
+            max_clone_workers: Maximum number of repositories cloned at once
+            shallow_clones: Clone only the latest commit of each repository,
+                rather than its full (blobless) history
+            clone_submodules: Also clone the git submodules of each repository
         """
         self.output_dir = Path(output_dir).resolve()
+        self.max_clone_workers = max_clone_workers
+        self.shallow_clones = shallow_clones
+        self.clone_submodules = clone_submodules
         self.project_root = self.output_dir
+        # Package name read from pyproject.toml (see _get_project_package_name)
+        self._project_package_name: Optional[str] = None
+        # Results of the CLI availability probes, set on first use
+        self.cli_command: Optional[str] = None
+        self._dbt_available: Optional[bool] = None
+        # Default dbt profiles location, referenced by every dbt component
+        self.dbt_profiles_dir = os.path.expanduser("~/.dbt")
 
     def generate_project(
         self,
@@ -60,11 +427,8 @@ class DagsterProjectGenerator:
             # Scaffold dbt component using CLI
             self._scaffold_dbt_component(project_name, dbt_project_path)
 
-        # Detect required dbt adapters
-        required_adapters = detect_adapters(environments)
-
-        # Extract environment variables
-        env_vars = extract_environment_variables(environments, jobs)
+        # Detect required dbt adapters and extract environment variables
+        required_adapters, env_vars = analyze_environments_and_jobs(environments, jobs)
 
         # Create package structure and register custom components
         self._create_package_structure()
@@ -73,36 +437,42 @@ class DagsterProjectGenerator:
         # Generate jobs and schedules as component-based YAML definitions
         self._generate_jobs_and_schedules(projects, jobs, environments, project_repos)
 
-        # Update pyproject.toml with dependencies including adapters and dagster-cloud
-        self._update_pyproject_toml(required_adapters)
-
-        # Generate .env file with environment variables
-        self._generate_env_file(env_vars)
-
-        # Generate dbt profiles.yml
-        self._generate_profiles_yml(environments)
-
-        # Generate git clone script
-        self._generate_git_clone_script(projects, project_repos)
-
-        # Generate migration validation script
-        self._generate_validation_script()
-
-        # Generate migration summary report
-        self._generate_migration_summary(projects, jobs, environments, project_repos, required_adapters)
-
-        # Generate README
-        self._generate_readme(projects, project_repos, required_adapters)
+        # The remaining files are independent of each other and each written to
+        # its own path, so generate them concurrently to overlap their I/O
+        with ThreadPoolExecutor(max_workers=7) as executor:
+            futures = [
+                # Update pyproject.toml with dependencies including adapters and dagster-cloud
+                executor.submit(self._update_pyproject_toml, required_adapters),
+                # Generate .env file with environment variables
+                executor.submit(self._generate_env_file, env_vars),
+                # Generate dbt profiles.yml
+                executor.submit(self._generate_profiles_yml, environments),
+                # Generate git clone script
+                executor.submit(self._generate_git_clone_script, projects, project_repos),
+                # Generate migration validation script
+                executor.submit(self._generate_validation_script),
+                # Generate migration summary report
+                executor.submit(
+                    self._generate_migration_summary, projects, jobs, environments, project_repos, required_adapters
+                ),
+                # Generate README
+                executor.submit(self._generate_readme, projects, project_repos, required_adapters),
+            ]
+            # Re-raise the first failure, in the order the files were listed
+            for future in futures:
+                future.result()
 
     def clone_repositories(self, projects: List[Dict[str, Any]], project_repos: Dict[int, str]):
         """Clone all dbt project repositories"""
-        import subprocess
-        
         # dbt projects should be siblings to the Dagster project, not inside it
         # This follows the typical Dagster + dbt project structure
         dbt_projects_dir = self.output_dir.parent / "dbt_projects"
         dbt_projects_dir.mkdir(exist_ok=True)
         
+        clones = []
+        # Projects sharing a name map to the same directory; only the first is
+        # cloned, as when clones ran one after another
+        seen: Set[Path] = set()
         for project in projects:
             project_id = project.get("id")
             if project_id not in project_repos:
@@ -112,25 +482,65 @@ class DagsterProjectGenerator:
             repo_url = project_repos[project_id]
             project_dir = dbt_projects_dir / project_name
             
-            if project_dir.exists():
+            if project_dir.exists() or project_dir in seen:
                 continue  # Skip silently, CLI will handle messaging
+            seen.add(project_dir)
             
+            clones.append((project_name, repo_url, project_dir))
+        
+        if not clones:
+            return
+        
+        # Clones are independent and network-bound, so run them concurrently.
+        # Blobless clones keep full history but only download file contents
+        # for the checked-out commit (shallow clones skip the history too);
+        # never block on a credential prompt.
+        env = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+        if self.shallow_clones:
+            clone_args = ["--depth=1"]
+        else:
+            clone_args = ["--filter=blob:none"]
+        # dbt projects may vendor packages as submodules, which dbt parse needs;
+        # only on request, since a private submodule fails the whole clone.
+        # Submodules are fetched in parallel (clone --jobs needs git 2.9+)
+        if self.clone_submodules:
+            clone_args += ["--recurse-submodules", "--jobs=8"]
+            if self.shallow_clones:
+                clone_args.append("--shallow-submodules")
+        
+        def clone(project_name: str, repo_url: str, project_dir: Path) -> Optional[str]:
+            """Clone one repository, returning an error message on failure"""
+            # Clone into a scratch directory and move it into place on success,
+            # so a failed clone never leaves a partial checkout that the next
+            # run would skip as already present
+            staging_dir = Path(tempfile.mkdtemp(prefix=f".{project_dir.name}-", dir=dbt_projects_dir))
             try:
-                subprocess.run(
-                    ["git", "clone", repo_url, str(project_dir)],
-                    check=True,
-                    capture_output=True,
-                    text=True
+                _run_quiet(
+                    ["git", "clone", *clone_args, repo_url, str(staging_dir)],
+                    env=env,
                 )
+                staging_dir.rename(project_dir)
             except subprocess.CalledProcessError as e:
-                raise Exception(f"Failed to clone {project_name}: {e.stderr}")
+                return f"Failed to clone {project_name}: {e.stderr}"
+            except OSError as e:
+                return f"Failed to clone {project_name}: {e}"
+            finally:
+                # Only ever removes this attempt's own scratch directory
+                shutil.rmtree(staging_dir, ignore_errors=True)
+            return None
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_clone_workers, len(clones)))) as executor:
+            errors = [error for error in executor.map(lambda args: clone(*args), clones) if error]
+        
+        # Report every failed clone (in project order), not just the first
+        if errors:
+            raise Exception("\n".join(errors))
 
     def generate_dbt_manifests(self, projects: List[Dict[str, Any]], project_repos: Dict[int, str]):
         """Generate dbt manifests for all cloned projects by running dbt parse"""
-        import subprocess
-        
         dbt_projects_dir = self.output_dir.parent / "dbt_projects"
         
+        project_dirs = []
         for project in projects:
             project_id = project.get("id")
             if project_id not in project_repos:
@@ -142,40 +552,29 @@ class DagsterProjectGenerator:
             if not project_dir.exists():
                 continue  # Skip if project wasn't cloned
             
-            # Check if dbt is available
+            project_dirs.append(project_dir)
+        
+        if not project_dirs:
+            return
+        
+        # Check if dbt is available (once per generator)
+        if self._dbt_available is None:
             try:
-                subprocess.run(["dbt", "--version"], capture_output=True, check=True)
+                _run_quiet(["dbt", "--version"])
+                self._dbt_available = True
             except (subprocess.CalledProcessError, FileNotFoundError):
-                # dbt not available - skip manifest generation
-                continue
-            
-            # Run dbt parse to generate manifest.json
-            # This creates target/manifest.json which Dagster needs
-            try:
-                subprocess.run(
-                    ["dbt", "parse"],
-                    cwd=project_dir,
-                    check=True,
-                    capture_output=True,
-                )
-            except subprocess.CalledProcessError as e:
-                # If dbt parse fails, try dbt compile as fallback
-                try:
-                    subprocess.run(
-                        ["dbt", "compile"],
-                        cwd=project_dir,
-                        check=True,
-                        capture_output=True,
-                    )
-                except subprocess.CalledProcessError:
-                    # If both fail, continue - user can run manually
-                    pass
+                self._dbt_available = False
+        if not self._dbt_available:
+            # dbt not available - skip manifest generation
+            return
+        
+        # Each parse is an independent, CPU-bound dbt process, so run one per core
+        max_workers = min(8, os.cpu_count() or 1, len(project_dirs))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(_parse_dbt_project, project_dirs))
 
     def copy_profiles_yml(self):
         """Copy profiles.yml.template to ~/.dbt/profiles.yml"""
-        import shutil
-        from pathlib import Path
-        
         # The template is generated in the output directory
         template_path = self.output_dir / "profiles.yml.template"
         if not template_path.exists():
@@ -191,39 +590,24 @@ class DagsterProjectGenerator:
 
     def install_dependencies(self):
         """Install dependencies in the generated Dagster project"""
-        import subprocess
-        
         try:
-            result = subprocess.run(
-                ["pip", "install", "-e", "."],
-                cwd=self.output_dir,
-                check=True,
-                capture_output=True,
-                text=True
-            )
+            _run_quiet(["pip", "install", "-e", "."], cwd=self.output_dir)
         except subprocess.CalledProcessError as e:
             raise Exception(f"Failed to install dependencies: {e.stderr}")
 
     def _check_dagster_cli(self):
         """Check if Dagster CLI is available - prioritize create-dagster (recommended)"""
+        if self.cli_command:
+            return  # Already probed
+
         # Try create-dagster first (recommended per Dagster docs)
         try:
-            result = subprocess.run(
-                ["create-dagster", "--version"],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
+            _run_quiet(["create-dagster", "--version"])
             self.cli_command = "create-dagster"
         except (subprocess.CalledProcessError, FileNotFoundError):
             # Fallback to dg
             try:
-                result = subprocess.run(
-                    ["dg", "--version"],
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
+                _run_quiet(["dg", "--version"])
                 self.cli_command = "dg"
             except (subprocess.CalledProcessError, FileNotFoundError):
                 raise RuntimeError(
@@ -236,7 +620,7 @@ class DagsterProjectGenerator:
         project_name = self.output_dir.name
 
         # If directory exists and is not empty, we'll work with it
-        if self.output_dir.exists() and any(self.output_dir.iterdir()):
+        if _dir_has_entries(self.output_dir):
             # Check if it's already a Dagster project
             project_package = self._get_project_package_name()
             if (self.output_dir / "pyproject.toml").exists() or (self.output_dir / project_package / "defs").exists():
@@ -264,15 +648,17 @@ class DagsterProjectGenerator:
                     cwd=self.output_dir.parent,
                 )
                 # Check if a subdirectory was created
-                possible_dirs = list(self.output_dir.parent.glob(f"{project_name}*"))
-                if possible_dirs:
-                    created_dir = possible_dirs[0].resolve()
+                with os.scandir(self.output_dir.parent) as entries:
+                    possible_dir = next(
+                        (entry.path for entry in entries if entry.name.startswith(project_name)), None
+                    )
+                if possible_dir:
+                    created_dir = Path(possible_dir).resolve()
                     # If create-dagster created a nested directory, move contents up
                     if created_dir != self.output_dir and created_dir.exists():
                         # Move all contents from nested directory to output_dir
                         if not self.output_dir.exists():
                             self.output_dir.mkdir(parents=True, exist_ok=True)
-                        import shutil
                         for item in created_dir.iterdir():
                             if item.name != self.output_dir.name:  # Avoid moving into itself
                                 dest = self.output_dir / item.name
@@ -293,13 +679,7 @@ class DagsterProjectGenerator:
                     self.output_dir.mkdir(parents=True, exist_ok=True)
                 
                 # Run dg init in the target directory
-                subprocess.run(
-                    ["dg", "init"],
-                    check=True,
-                    cwd=self.output_dir,
-                    capture_output=True,
-                    text=True,
-                )
+                _run_quiet(["dg", "init"], cwd=self.output_dir)
             else:
                 # No CLI available, create minimal structure
                 self._create_minimal_dagster_structure()
@@ -318,9 +698,8 @@ class DagsterProjectGenerator:
         (package_dir / "defs").mkdir(exist_ok=True)
         
         # Create minimal pyproject.toml
-        project_package = self._get_project_package_name()
         pyproject_content = f"""[project]
-name = "dagster-dbt-migration"
+name = "{_DEFAULT_PROJECT_NAME}"
 version = "0.1.0"
 requires-python = ">=3.10"
 dependencies = [
@@ -340,6 +719,7 @@ root_module = "{project_package}"
 """
         with open(self.output_dir / "pyproject.toml", "w") as f:
             f.write(pyproject_content)
+        self._remember_written_project_name()
 
     def _scaffold_dbt_component(self, component_name: str, dbt_project_path: str):
         """
@@ -375,9 +755,6 @@ root_module = "{project_package}"
         # For profiles_dir: Use default dbt location (~/.dbt)
         # Dagster's dbt component will automatically find profiles.yml in the default location
         # No need to set DBT_PROFILES_DIR env var - the component handles this
-        import os
-        profiles_dir = os.path.expanduser("~/.dbt")
-        
         defs_config = {
             "type": "dagster_dbt.DbtProjectComponent",
             "attributes": {
@@ -387,13 +764,13 @@ root_module = "{project_package}"
                     "project_dir": relative_path,
                     # Use default dbt profiles location
                     # Dagster will automatically find profiles.yml in ~/.dbt
-                    "profiles_dir": profiles_dir,
+                    "profiles_dir": self.dbt_profiles_dir,
                 },
             },
         }
 
-        with open(defs_dir / "defs.yaml", "w") as f:
-            yaml.dump(defs_config, f, default_flow_style=False, sort_keys=False)
+        with open(defs_dir / "defs.yaml", "wb") as f:
+            yaml.dump(defs_config, f, Dumper=_SafeDumper, **_DEFS_YAML_OPTIONS)
 
     def _create_package_structure(self):
         """Create proper Python package structure"""
@@ -451,70 +828,26 @@ root_module = "{project_package}"
                     f.write('defs = load_from_defs_folder(project_root=Path(__file__).parent)\n')
 
     def _register_custom_components(self):
-        """Register custom components using Dagster CLI and copy component files"""
+        """Register custom components by copying their implementations into the project"""
         # Components are automatically registered when in the project structure
-        # We'll scaffold the component structure and then copy our implementations
         
         project_package = self._get_project_package_name()
         package_dir = self.output_dir / project_package
         components_dir = package_dir / "components"
         components_dir.mkdir(parents=True, exist_ok=True)
         
-        # Try to scaffold JobComponent using CLI (if it doesn't exist)
-        job_component_file = components_dir / "job.py"
-        if not job_component_file.exists():
-            try:
-                # Use dg scaffold component to create the structure
-                subprocess.run(
-                    ["dg", "scaffold", "component", "JobComponent"],
-                    check=True,
-                    cwd=self.output_dir,
-                    capture_output=True,
-                )
-            except subprocess.CalledProcessError:
-                # If scaffold fails, we'll create it manually
-                pass
-        
-        # Try to scaffold ScheduleComponent using CLI (if it doesn't exist)
-        schedule_component_file = components_dir / "schedule.py"
-        if not schedule_component_file.exists():
-            try:
-                subprocess.run(
-                    ["dg", "scaffold", "component", "ScheduleComponent"],
-                    check=True,
-                    cwd=self.output_dir,
-                    capture_output=True,
-                )
-            except subprocess.CalledProcessError:
-                # If scaffold fails, we'll create it manually
-                pass
-        
-        # Try to scaffold SensorComponent using CLI (if it doesn't exist)
-        sensor_component_file = components_dir / "sensor.py"
-        if not sensor_component_file.exists():
-            try:
-                subprocess.run(
-                    ["dg", "scaffold", "component", "SensorComponent"],
-                    check=True,
-                    cwd=self.output_dir,
-                    capture_output=True,
-                )
-            except subprocess.CalledProcessError:
-                # If scaffold fails, we'll create it manually
-                pass
-        
-        # Copy our custom component implementations (overwriting scaffolded versions)
-        job_component_source = Path(__file__).parent / "components" / "job.py"
-        if job_component_source.exists():
-            shutil.copy2(job_component_source, job_component_file)
-        
-        schedule_component_source = Path(__file__).parent / "components" / "schedule.py"
-        if schedule_component_source.exists():
-            shutil.copy2(schedule_component_source, schedule_component_file)
-        
-        sensor_component_source = Path(__file__).parent / "components" / "sensor.py"
-        if sensor_component_source.exists():
-            shutil.copy2(sensor_component_source, sensor_component_file)
+        # Copy our custom component implementations into the project.
+        # copyfile uses the kernel's zero-copy path and skips copying metadata.
+        # Files are copied rather than hard-linked so that editing the generated
+        # project can never modify the installed package.
+        components_source_dir = Path(__file__).parent / "components"
+        for file_name in ("job.py", "schedule.py", "sensor.py"):
+            component_source = components_source_dir / file_name
+            # The generated __init__.py imports the DbtCloud* classes from these
+            # files, which only the bundled implementations provide
+            if not component_source.exists():
+                raise FileNotFoundError(f"Bundled component implementation not found at {component_source}")
+            shutil.copyfile(component_source, components_dir / file_name)
         
         # Ensure __init__.py exists (always generate with correct names, don't copy from source)
         init_file = components_dir / "__init__.py"
@@ -541,22 +874,30 @@ root_module = "{project_package}"
     ):
         """Generate jobs and schedules as component-based YAML definitions"""
         # Group jobs by project
-        jobs_by_project = {}
+        jobs_by_project: Dict[Any, List[Dict[str, Any]]] = {}
         for job in jobs:
             project_id = job.get("project_id")
-            if project_id not in project_repos:
-                continue
-            if project_id not in jobs_by_project:
-                jobs_by_project[project_id] = []
-            jobs_by_project[project_id].append(job)
+            if project_id in project_repos:
+                jobs_by_project.setdefault(project_id, []).append(job)
 
         # Create component-based YAML definitions for jobs, schedules, and sensors
         all_job_defs = []
         all_schedule_defs = []
         all_sensor_defs = []
         
+        # Component types use the full module path for proper registration; they
+        # are the same for every job, so build them once
+        project_package = self._get_project_package_name()
+        job_component_type = f"{project_package}.components.job.DbtCloudJobComponent"
+        schedule_component_type = f"{project_package}.components.schedule.DbtCloudScheduleComponent"
+        sensor_component_type = f"{project_package}.components.sensor.DbtCloudSensorComponent"
+        
+        # Index projects and environments by ID once, rather than searching per job
+        projects_by_id = {p.get("id"): p for p in projects}
+        environments_by_id = {e.get("id"): e for e in environments}
+        
         for project_id, project_jobs in jobs_by_project.items():
-            project = next((p for p in projects if p.get("id") == project_id), None)
+            project = projects_by_id.get(project_id)
             if not project:
                 continue
 
@@ -567,61 +908,31 @@ root_module = "{project_package}"
             # The component name is the sanitized project name
             component_name = project_name
 
-            for job in project_jobs:
+            # Prefixed job names seen so far in this project, before deduplication
+            seen_job_names: Set[str] = set()
+            # Sanitize each job's name and resolve its deployment type prefix once;
+            # completion triggers reuse them to reference the jobs they monitor
+            job_name_parts = [
+                (self._get_env_prefix(job, environments_by_id), self._sanitize_name(job.get("name", f"job_{job.get('id')}")))
+                for job in project_jobs
+            ]
+            job_name_parts_by_id: Dict[Any, tuple] = {}
+            for job, name_parts in zip(project_jobs, job_name_parts):
+                job_name_parts_by_id.setdefault(job.get("id"), name_parts)
+
+            for job, (env_prefix, job_name) in zip(project_jobs, job_name_parts):
                 job_id = job.get("id")
-                job_name = self._sanitize_name(job.get("name", f"job_{job_id}"))
-                
-                # Get deployment type for prefixing (e.g., PROD, STG, DEV)
-                job_env_id = job.get("environment_id")
-                env_prefix = ""
-                if job_env_id:
-                    env = next((e for e in environments if e.get("id") == job_env_id), None)
-                    if env:
-                        # Try to extract deployment type prefix
-                        deployment_prefix = self._extract_deployment_type_prefix(env)
-                        if deployment_prefix:
-                            env_prefix = f"{deployment_prefix}__"
-                        else:
-                            # Fallback to environment name if deployment type not available
-                            env_name = env.get("name", "").upper().strip()
-                            env_prefix = self._sanitize_name(env_name)
-                            if env_prefix:
-                                env_prefix = f"{env_prefix}__"
-                    else:
-                        # Environment not found - this shouldn't happen but handle gracefully
-                        import sys
-                        if not hasattr(self, '_env_not_found_warned'):
-                            print(f"⚠️  Warning: Environment ID {job_env_id} not found in environments list", file=sys.stderr)
-                            self._env_not_found_warned = True
+                job_display_name = job.get("name", f"job_{job_id}")
                 
                 # Ensure unique job names by including job ID if names are duplicated
                 # Check if we've already seen this job name (with same deployment type)
-                existing_job_names = []
-                for j in project_jobs[:project_jobs.index(job)]:
-                    existing_job_id = j.get("id")
-                    existing_job_name = self._sanitize_name(j.get("name", f"job_{existing_job_id}"))
-                    existing_env_id = j.get("environment_id")
-                    existing_env_prefix = ""
-                    if existing_env_id:
-                        existing_env = next((e for e in environments if e.get("id") == existing_env_id), None)
-                        if existing_env:
-                            # Try to extract deployment type prefix
-                            existing_deployment_prefix = self._extract_deployment_type_prefix(existing_env)
-                            if existing_deployment_prefix:
-                                existing_env_prefix = f"{existing_deployment_prefix}__"
-                            else:
-                                # Fallback to environment name
-                                existing_env_name = existing_env.get("name", "").upper().strip()
-                                existing_env_prefix = self._sanitize_name(existing_env_name)
-                                if existing_env_prefix:
-                                    existing_env_prefix = f"{existing_env_prefix}__"
-                    existing_job_names.append(f"{existing_env_prefix}{existing_job_name}")
-                
                 full_job_name = f"{env_prefix}{job_name}"
-                if full_job_name in existing_job_names:
+                if full_job_name in seen_job_names:
                     # If still duplicate, append job ID
                     job_name = f"{job_name}_{job_id}"
                     full_job_name = f"{env_prefix}{job_name}"
+                else:
+                    seen_job_names.add(full_job_name)
                 
                 job_name_safe = f"{project_name}_{full_job_name}"
 
@@ -629,12 +940,10 @@ root_module = "{project_package}"
                 # Jobs reference assets from the dbt component using asset selection
                 # Format: "component_name.*" to select all assets from the component
                 # Note: Asset selection uses wildcard pattern matching
-                # Component type uses full module path for proper registration
-                project_package = self._get_project_package_name()
                 
                 # Extract job configuration from dbt Cloud
                 execute_steps = job.get("execute_steps", [])
-                job_description = job.get("description") or f"Job migrated from dbt Cloud: {job.get('name', f'job_{job_id}')}"
+                job_description = job.get("description") or f"Job migrated from dbt Cloud: {job_display_name}"
                 
                 # Parse dbt selection syntax from execute_steps
                 # Examples: "dbt build --select model_a model_b", "dbt run --select +model_a", "dbt build"
@@ -662,7 +971,7 @@ root_module = "{project_package}"
                 job_env_id = job.get("environment_id")
                 if job_env_id:
                     # Find the environment to get its name
-                    env = next((e for e in environments if e.get("id") == job_env_id), None)
+                    env = environments_by_id.get(job_env_id)
                     if env:
                         env_name = env.get("name", "").lower().replace(" ", "_")
                         # Use environment name as target (e.g., "stg", "prod")
@@ -674,7 +983,7 @@ root_module = "{project_package}"
                     job_attributes["tags"] = tags
                 
                 job_def = {
-                    "type": f"{project_package}.components.job.DbtCloudJobComponent",
+                    "type": job_component_type,
                     "attributes": job_attributes,
                 }
                 all_job_defs.append(job_def)
@@ -687,12 +996,12 @@ root_module = "{project_package}"
                     cron = schedule.get("cron")
                     if cron:
                         schedule_def = {
-                            "type": f"{project_package}.components.schedule.DbtCloudScheduleComponent",
+                            "type": schedule_component_type,
                             "attributes": {
                                 "schedule_name": f"{job_name_safe}_schedule",
                                 "cron_expression": cron,
                                 "job_name": job_name_safe,  # Reference the job we just created
-                                "description": f"Schedule migrated from dbt Cloud for {job.get('name', f'job_{job_id}')}",
+                                "description": f"Schedule migrated from dbt Cloud for {job_display_name}",
                                 "default_status": "RUNNING",
                             },
                         }
@@ -702,161 +1011,111 @@ root_module = "{project_package}"
                 # Create a sensor to monitor the trigger job's run status
                 completion_trigger = job.get("job_completion_trigger_condition")
                 if completion_trigger:
-                    trigger_job_id = completion_trigger.get("condition", {}).get("job_id")
-                    trigger_statuses = completion_trigger.get("condition", {}).get("statuses", [])
-                    # Find the trigger job name
-                    trigger_job = next((j for j in project_jobs if j.get("id") == trigger_job_id), None)
-                    if trigger_job:
-                        # Find the trigger job's full name (with deployment type prefix) from all_job_defs
-                        # This ensures we reference the correct job name that was already created
-                        trigger_job_name_safe = None
-                        trigger_job_id_check = trigger_job.get("id")
-                        for j_def in all_job_defs:
-                            j_attrs = j_def.get("attributes", {})
-                            j_name = j_attrs.get("job_name", "")
-                            # The job_name in attributes should match the pattern: project_name_DEPLOYMENT_TYPE__job_name
-                            # We need to find the job that corresponds to this trigger_job_id
-                            # Since we can't easily match by ID, we'll construct it using the same logic
-                            trigger_job_name_base = self._sanitize_name(trigger_job.get("name", f"job_{trigger_job_id_check}"))
-                            trigger_env_id = trigger_job.get("environment_id")
-                            trigger_env_prefix = ""
-                            if trigger_env_id:
-                                trigger_env = next((e for e in environments if e.get("id") == trigger_env_id), None)
-                                if trigger_env:
-                                    # Try to extract deployment type prefix
-                                    trigger_deployment_prefix = self._extract_deployment_type_prefix(trigger_env)
-                                    if trigger_deployment_prefix:
-                                        trigger_env_prefix = f"{trigger_deployment_prefix}__"
-                                    else:
-                                        # Fallback to environment name
-                                        trigger_env_name = trigger_env.get("name", "").upper().strip()
-                                        trigger_env_prefix = self._sanitize_name(trigger_env_name)
-                                        if trigger_env_prefix:
-                                            trigger_env_prefix = f"{trigger_env_prefix}__"
-                            full_trigger_job_name = f"{trigger_env_prefix}{trigger_job_name_base}"
-                            trigger_job_name_safe = f"{project_name}_{full_trigger_job_name}"
-                            break
+                    condition = completion_trigger.get("condition") or {}
+                    trigger_job_id = condition.get("job_id")
+                    trigger_statuses = condition.get("statuses") or []
+                    # Find the trigger job name (only jobs in the same project can trigger)
+                    trigger_name_parts = job_name_parts_by_id.get(trigger_job_id)
+                    if trigger_name_parts:
+                        # Build the trigger job's full name (with deployment type prefix) using
+                        # the same logic as its job definition
+                        trigger_env_prefix, trigger_job_name_base = trigger_name_parts
+                        full_trigger_job_name = f"{trigger_env_prefix}{trigger_job_name_base}"
+                        trigger_job_name_safe = f"{project_name}_{full_trigger_job_name}"
                         
-                        # Map dbt Cloud status codes to Dagster run statuses
-                        # dbt Cloud status codes: 1=Queued, 2=Started, 3=Running, 10=Success, 20=Error, 30=Cancelled
                         # Dagster supports multiple statuses by creating separate sensors for each
                         # We'll create one sensor per status in trigger_statuses
                         
-                        # All possible dbt Cloud status codes and their Dagster equivalents
-                        status_code_map = {
-                            10: "SUCCESS",   # Success
-                            20: "FAILURE",   # Error
-                            30: "CANCELED",  # Cancelled
-                            2: "STARTED",    # Started
-                            1: "QUEUED",     # Queued (not directly supported in Dagster, but we can map it)
-                            3: "STARTED",    # Running (map to STARTED)
-                        }
-                        
                         # If trigger_statuses is empty or very large, assume "all statuses"
                         # dbt Cloud typically has 4-5 status types, so if we see more than 3, it's likely "all"
-                        all_possible_statuses = [10, 20, 30, 2]  # Success, Error, Cancelled, Started
-                        if len(trigger_statuses) >= len(all_possible_statuses) or len(trigger_statuses) == 0:
+                        if len(trigger_statuses) >= len(_ALL_TRIGGER_STATUSES) or len(trigger_statuses) == 0:
                             # Create sensors for all common statuses
-                            trigger_statuses = all_possible_statuses
+                            trigger_statuses = _ALL_TRIGGER_STATUSES
+                        has_multiple_statuses = len(trigger_statuses) > 1
+                        sensor_description_prefix = (
+                            f"Sensor migrated from dbt Cloud: triggers {job_display_name} when {trigger_job_name_safe} completes with"
+                        )
                         
                         # Create one sensor per status
                         for status_code in trigger_statuses:
-                            dagster_status = status_code_map.get(status_code, "SUCCESS")
+                            dagster_status = _DBT_CLOUD_RUN_STATUSES.get(status_code, "SUCCESS")
                             
                             # Skip QUEUED as Dagster doesn't have a direct equivalent
                             if dagster_status == "QUEUED":
                                 continue
                             
                             # Create sensor name (include status if multiple statuses)
-                            if len(trigger_statuses) > 1:
+                            if has_multiple_statuses:
                                 sensor_name = f"{job_name_safe}_sensor_{dagster_status.lower()}"
                             else:
                                 sensor_name = f"{job_name_safe}_sensor"
                             
-                            # Build status description
-                            status_descriptions = {
-                                "SUCCESS": "success",
-                                "FAILURE": "failure/error",
-                                "CANCELED": "cancellation",
-                                "STARTED": "start",
-                            }
-                            status_desc = status_descriptions.get(dagster_status, dagster_status.lower())
+                            status_desc = _RUN_STATUS_DESCRIPTIONS.get(dagster_status, dagster_status.lower())
                             
                             sensor_def = {
-                                "type": f"{project_package}.components.sensor.DbtCloudSensorComponent",
+                                "type": sensor_component_type,
                                 "attributes": {
                                     "sensor_name": sensor_name,
                                     "sensor_type": "run_status",
                                     "job_name": job_name_safe,  # The job to trigger
                                     "monitored_job_name": trigger_job_name_safe,  # The job to monitor
                                     "run_status": dagster_status,
-                                    "description": f"Sensor migrated from dbt Cloud: triggers {job.get('name', f'job_{job_id}')} when {trigger_job_name_safe} completes with {status_desc}",
+                                    "description": f"{sensor_description_prefix} {status_desc}",
                                     "minimum_interval_seconds": 30,
                                     "default_status": "RUNNING",
                                 },
                             }
                             all_sensor_defs.append(sensor_def)
 
+        # Serialize every component first, then write the files in one batch.
+        # Files are keyed by path so a later definition still replaces an earlier
+        # one with the same name, as when they were written one at a time.
+        pending_writes: Dict[Path, bytes] = {}
+        defs_dir = self.output_dir / project_package / "defs"
+
         # Write jobs as component-based YAML
         # Each component should be in its own folder with defs.yaml (standard Dagster structure)
-        project_package = self._get_project_package_name()
-        if all_job_defs:
-            # Create directory structure manually (more reliable than scaffold)
-            jobs_dir = self.output_dir / project_package / "defs" / "jobs"
-            jobs_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Write each job to its own folder with defs.yaml (standard Dagster component structure)
-            # Create a custom YAML dumper that ensures tag values are strings
-            class TagStringDumper(yaml.SafeDumper):
-                def represent_str(self, data):
-                    return self.represent_scalar('tag:yaml.org,2002:str', str(data))
-            
-            TagStringDumper.add_representer(int, TagStringDumper.represent_str)
-            
-            for i, job_def in enumerate(all_job_defs):
-                job_name = job_def.get("attributes", {}).get("job_name", f"job_{i}")
-                job_folder = jobs_dir / job_name
-                job_folder.mkdir(parents=True, exist_ok=True)
-                job_file = job_folder / "defs.yaml"
-                with open(job_file, "w") as f:
-                    # Ensure tag values in attributes are strings before dumping
-                    if "tags" in job_def.get("attributes", {}):
-                        tags = job_def["attributes"]["tags"]
-                        job_def["attributes"]["tags"] = {k: str(v) for k, v in tags.items()}
-                    yaml.dump(job_def, f, Dumper=TagStringDumper, default_flow_style=False, sort_keys=False)
+        # (created manually, which is more reliable than scaffold)
+        for i, job_def in enumerate(all_job_defs):
+            job_name = job_def.get("attributes", {}).get("job_name", f"job_{i}")
+            # Tag values are built as strings, and _TagStringDumper writes any int as one
+            job_file = defs_dir / "jobs" / job_name / "defs.yaml"
+            pending_writes[job_file] = yaml.dump(job_def, Dumper=_TagStringDumper, **_DEFS_YAML_OPTIONS)
 
         # Write schedules as component-based YAML
-        # Each component should be in its own folder with defs.yaml (standard Dagster structure)
-        if all_schedule_defs:
-            # Create directory structure manually (more reliable than scaffold)
-            schedules_dir = self.output_dir / project_package / "defs" / "schedules"
-            schedules_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Write each schedule to its own folder with defs.yaml (standard Dagster component structure)
-            for i, schedule_def in enumerate(all_schedule_defs):
-                schedule_name = schedule_def.get("attributes", {}).get("schedule_name", f"schedule_{i}")
-                schedule_folder = schedules_dir / schedule_name
-                schedule_folder.mkdir(parents=True, exist_ok=True)
-                schedule_file = schedule_folder / "defs.yaml"
-                with open(schedule_file, "w") as f:
-                    yaml.dump(schedule_def, f, default_flow_style=False, sort_keys=False)
+        for i, schedule_def in enumerate(all_schedule_defs):
+            schedule_name = schedule_def.get("attributes", {}).get("schedule_name", f"schedule_{i}")
+            schedule_file = defs_dir / "schedules" / schedule_name / "defs.yaml"
+            pending_writes[schedule_file] = yaml.dump(schedule_def, Dumper=_SafeDumper, **_DEFS_YAML_OPTIONS)
         
         # Write sensors as component-based YAML
-        # Each component should be in its own folder with defs.yaml (standard Dagster structure)
-        if all_sensor_defs:
-            # Create directory structure manually (more reliable than scaffold)
-            sensors_dir = self.output_dir / project_package / "defs" / "sensors"
-            sensors_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Write each sensor to its own folder with defs.yaml (standard Dagster component structure)
-            for i, sensor_def in enumerate(all_sensor_defs):
-                sensor_name = sensor_def.get("attributes", {}).get("sensor_name", f"sensor_{i}")
-                sensor_folder = sensors_dir / sensor_name
-                sensor_folder.mkdir(parents=True, exist_ok=True)
-                sensor_file = sensor_folder / "defs.yaml"
-                with open(sensor_file, "w") as f:
-                    yaml.dump(sensor_def, f, default_flow_style=False, sort_keys=False)
+        for i, sensor_def in enumerate(all_sensor_defs):
+            sensor_name = sensor_def.get("attributes", {}).get("sensor_name", f"sensor_{i}")
+            sensor_file = defs_dir / "sensors" / sensor_name / "defs.yaml"
+            pending_writes[sensor_file] = yaml.dump(sensor_def, Dumper=_SafeDumper, **_DEFS_YAML_OPTIONS)
+
+        self._write_files(pending_writes)
+
+    def _write_files(self, files: Dict[Path, bytes]):
+        """Write many small files, creating their directories first"""
+        if not files:
+            return
+
+        # Component folders share a few parents (e.g. defs/jobs), so create those
+        # once and then each folder with a single mkdir, skipping the parent walk
+        directories = {path.parent for path in files}
+        for parent in {directory.parent for directory in directories}:
+            parent.mkdir(parents=True, exist_ok=True)
+        for directory in directories:
+            try:
+                os.mkdir(directory)
+            except FileExistsError:
+                pass
 
+        # Each write is dominated by open/write/close syscalls rather than
+        # bandwidth, so overlap them across threads
+        with ThreadPoolExecutor(max_workers=min(32, len(files))) as executor:
+            list(executor.map(lambda item: item[0].write_bytes(item[1]), files.items()))
 
     def _update_pyproject_toml(self, required_adapters: Set[str]):
         """Update pyproject.toml to include all required dependencies"""
@@ -879,15 +1138,13 @@ root_module = "{project_package}"
         if not pyproject_path.exists():
             # Create new pyproject.toml
             project_package = self._get_project_package_name()
+            dependency_lines = "".join(f'    "{dep}",\n' for dep in dependencies)
             content = f"""[project]
-name = "dagster-dbt-migration"
+name = "{_DEFAULT_PROJECT_NAME}"
 version = "0.1.0"
 requires-python = ">=3.10"
 dependencies = [
-"""
-            for dep in dependencies:
-                content += f'    "{dep}",\n'
-            content += """]
+{dependency_lines}]
 
 [tool.setuptools]
 packages = ["{project_package}"]
@@ -901,112 +1158,35 @@ directory_type = "project"
 [tool.dg.project]
 root_module = "{project_package}"
 """
-            with open(pyproject_path, "w") as f:
-                f.write(content)
+            _write_text(pyproject_path, content)
+            self._remember_written_project_name()
             return
 
         # Read existing pyproject.toml
         with open(pyproject_path, "r") as f:
-            content = f.read()
+            doc = tomlkit.parse(f.read())
 
-        # Simple approach: append missing dependencies and update requires-python
-        # In production, you might want to parse TOML properly
+        # Update the parsed document in place; tomlkit keeps the existing
+        # formatting and comments when it is written back
         project_package = self._get_project_package_name()
-        lines = content.split("\n")
-        new_lines = []
-        in_dependencies = False
-        existing_deps = set()
-        has_tool_dg = False
-        has_tool_dg_project = False
-        has_setuptools = False
-        
-        for line in lines:
-            # Check if tool.dg.project section exists
-            if '[tool.dg.project]' in line:
-                has_tool_dg_project = True
-                new_lines.append(line)
-                continue
-            elif 'root_module' in line and 'tool.dg' in content[:content.find(line)]:
-                # Update root_module if it exists
-                new_lines.append(f'root_module = "{project_package}"')
-                continue
-            # Check if tool.dg section exists
-            elif '[tool.dg]' in line:
-                has_tool_dg = True
-                new_lines.append(line)
-                continue
-            elif 'tool.dg' in line and 'directory_type' in line:
-                # Update directory_type if it exists
-                new_lines.append('directory_type = "project"')
-                continue
-            # Check for setuptools configuration
-            elif '[tool.setuptools]' in line:
-                has_setuptools = True
-                new_lines.append(line)
-                continue
-            elif 'packages =' in line and has_setuptools:
-                # Update packages if setuptools section exists
-                new_lines.append(f'packages = ["{project_package}"]')
-                continue
-            # Update requires-python to >=3.10 for Dagster 1.12+ compatibility
-            elif 'requires-python' in line and '<3.10' in line:
-                new_lines.append('requires-python = ">=3.10"')
-                continue
-            elif 'requires-python' in line:
-                # Replace any existing requires-python with >=3.10
-                new_lines.append('requires-python = ">=3.10"')
-                continue
-            elif 'dependencies = [' in line:
-                in_dependencies = True
-                new_lines.append(line)
-            elif in_dependencies:
-                if line.strip().startswith('"') and line.strip().endswith('",'):
-                    # Extract dependency name
-                    dep_name = line.strip().strip('",').split('>=')[0].split('==')[0]
-                    existing_deps.add(dep_name)
-                    new_lines.append(line)
-                elif line.strip() == "]":
-                    # Add missing dependencies before closing bracket
-                    for dep in dependencies:
-                        dep_name = dep.split('>=')[0].split('==')[0]
-                        if dep_name not in existing_deps:
-                            new_lines.append(f'    "{dep}",')
-                    new_lines.append(line)
-                    in_dependencies = False
-                else:
-                    new_lines.append(line)
-            else:
-                new_lines.append(line)
-        
-        # Add setuptools configuration if it doesn't exist
-        if not has_setuptools:
-            # Find where to insert - after [project] section
-            insert_idx = len(new_lines)
-            for i, line in enumerate(new_lines):
-                if line.strip() == "]" and in_dependencies:
-                    insert_idx = i + 1
-                    break
-            new_lines.insert(insert_idx, "")
-            new_lines.insert(insert_idx + 1, "[tool.setuptools]")
-            new_lines.insert(insert_idx + 2, f'packages = ["{project_package}"]')
-        
-        # Add tool.dg.project section if it doesn't exist
-        if not has_tool_dg_project:
-            if not has_tool_dg:
-                new_lines.append("")
-                new_lines.append("[tool.dg]")
-                new_lines.append('directory_type = "project"')
-            new_lines.append("")
-            new_lines.append("[tool.dg.project]")
-            new_lines.append(f'root_module = "{project_package}"')
-        elif not has_tool_dg:
-            # Add tool.dg section if project section exists but main section doesn't
-            new_lines.append("")
-            new_lines.append("[tool.dg]")
-            new_lines.append('directory_type = "project"')
-
-        with open(pyproject_path, "w") as f:
-            f.write("\n".join(new_lines))
+        project = doc.setdefault("project", tomlkit.table())
+        # Update requires-python to >=3.10 for Dagster 1.12+ compatibility
+        project["requires-python"] = ">=3.10"
+
+        # Append missing dependencies
+        project_dependencies = project.setdefault("dependencies", tomlkit.array())
+        existing_deps = {_dependency_name(dep) for dep in project_dependencies}
+        for dep in dependencies:
+            if _dependency_name(dep) not in existing_deps:
+                project_dependencies.append(dep)
+
+        tool = doc.setdefault("tool", tomlkit.table(is_super_table=True))
+        tool.setdefault("setuptools", tomlkit.table())["packages"] = [project_package]
+        tool_dg = tool.setdefault("dg", tomlkit.table())
+        tool_dg["directory_type"] = "project"
+        tool_dg.setdefault("project", tomlkit.table())["root_module"] = project_package
+
+        _write_text(pyproject_path, tomlkit.dumps(doc))
 
     def _generate_env_file(self, env_vars: Dict[str, str]):
         """Generate .env file with environment variables"""
@@ -1028,35 +1208,36 @@ root_module = "{project_package}"
 # DBT_DEV_DATABASE=your_database
 """
         else:
-            content = "# Environment variables extracted from dbt Cloud\n"
-            content += "# Review and update these values, especially passwords and tokens\n\n"
-            content += "# Local Development (DuckDB)\n"
-            content += "# Use 'local' target for DuckDB-based local development\n"
-            content += "# Set DBT_TARGET=local or use: dbt run --target local\n\n"
+            parts: List[str] = []
+            parts.append("# Environment variables extracted from dbt Cloud\n")
+            parts.append("# Review and update these values, especially passwords and tokens\n\n")
+            parts.append("# Local Development (DuckDB)\n")
+            parts.append("# Use 'local' target for DuckDB-based local development\n")
+            parts.append("# Set DBT_TARGET=local or use: dbt run --target local\n\n")
             
             # Note: DBT_PROFILES_DIR is not needed - Dagster dbt component
             # automatically finds profiles.yml in ~/.dbt (default location)
             # If you need a custom profiles location, you can set it here:
             # DBT_PROFILES_DIR=~/.dbt
-            content += "\n"
+            parts.append("\n")
             
             for key, value in sorted(env_vars.items()):
                 # Skip DBT_PROFILES_DIR - Dagster handles this automatically
                 if key != "DBT_PROFILES_DIR":
-                    content += f"{key}={value}\n"
+                    parts.append(f"{key}={value}\n")
             
-            content += "\n# Dagster Cloud Deployment Variables\n"
-            content += "# These are automatically available in Dagster Cloud deployments:\n"
-            content += "# - DAGSTER_CLOUD_DEPLOYMENT_NAME: deployment name (e.g., 'prod', 'staging')\n"
-            content += "# - DAGSTER_CLOUD_IS_BRANCH_DEPLOYMENT: '1' if branch deployment\n"
-            content += "# - DAGSTER_CLOUD_GIT_BRANCH: git branch name (branch deployments)\n"
-            content += "# - DAGSTER_CLOUD_GIT_SHA: commit SHA (branch deployments)\n"
-            content += "# See MIGRATION_SUMMARY.md for full list and usage examples\n\n"
+            parts.append("\n# Dagster Cloud Deployment Variables\n")
+            parts.append("# These are automatically available in Dagster Cloud deployments:\n")
+            parts.append("# - DAGSTER_CLOUD_DEPLOYMENT_NAME: deployment name (e.g., 'prod', 'staging')\n")
+            parts.append("# - DAGSTER_CLOUD_IS_BRANCH_DEPLOYMENT: '1' if branch deployment\n")
+            parts.append("# - DAGSTER_CLOUD_GIT_BRANCH: git branch name (branch deployments)\n")
+            parts.append("# - DAGSTER_CLOUD_GIT_SHA: commit SHA (branch deployments)\n")
+            parts.append("# See MIGRATION_SUMMARY.md for full list and usage examples\n\n")
             
-            content += "# Add any additional environment variables needed for your setup\n"
+            parts.append("# Add any additional environment variables needed for your setup\n")
+            content = "".join(parts)
 
-        with open(env_path, "w") as f:
-            f.write(content)
+        _write_text(env_path, content)
 
     def _generate_profiles_yml(self, environments: List[Dict[str, Any]]):
         """Generate dbt profiles.yml file"""
@@ -1067,66 +1248,47 @@ root_module = "{project_package}"
         dbt_dir.mkdir(exist_ok=True)
         
         profiles_path = dbt_dir / "profiles.yml"
-        with open(profiles_path, "w") as f:
-            f.write("# dbt profiles.yml generated from dbt Cloud migration\n")
-            f.write("# Review and update environment variable references as needed\n\n")
-            f.write(profiles_content)
+        _write_text(profiles_path, (
+            "# dbt profiles.yml generated from dbt Cloud migration\n"
+            "# Review and update environment variable references as needed\n\n"
+        ) + profiles_content)
         
         # Also create a template in the project root for reference
         template_path = self.output_dir / "profiles.yml.template"
-        with open(template_path, "w") as f:
-            f.write("# Template dbt profiles.yml\n")
-            f.write("# Copy this to ~/.dbt/profiles.yml and update with your credentials\n")
-            f.write("# \n")
-            f.write("# Default Target: 'local' (DuckDB) for local development\n")
-            f.write("#   - DuckDB database will be created at the path specified in DBT_DUCKDB_PATH\n")
-            f.write("#   - No additional setup needed for local development\n")
-            f.write("# \n")
-            f.write("# Deployment-Aware Configuration:\n")
-            f.write("#   The dbt components are ALREADY configured with deployment-aware target selection!\n")
-            f.write("#   They use DAGSTER_CLOUD_DEPLOYMENT_NAME to automatically select the right target.\n")
-            f.write("#   \n")
-            f.write("#   To make profiles.yml match this behavior, update the 'target' field:\n")
-            f.write("#     target: \"{{ env_var('DAGSTER_CLOUD_DEPLOYMENT_NAME', 'local') }}\"\n")
-            f.write("#   \n")
-            f.write("#   This matches the pattern from the Dagster demo project:\n")
-            f.write("#   https://github.com/dagster-io/hooli-data-eng-pipelines/blob/master/hooli-data-eng/src/hooli_data_eng/defs/dbt/resources.py\n")
-            f.write("# \n")
-            f.write("# See MIGRATION_SUMMARY.md for more details.\n\n")
-            f.write(profiles_content)
+        _write_text(template_path, _PROFILES_TEMPLATE_HEADER + profiles_content)
 
     def _generate_git_clone_script(self, projects: List[Dict[str, Any]], project_repos: Dict[int, str]):
         """Generate a script to clone all dbt project repositories"""
         script_path = self.output_dir / "clone_dbt_projects.sh"
         
-        content = "#!/bin/bash\n"
-        content += "# Script to clone all dbt project repositories\n"
-        content += "# dbt projects are cloned as siblings to the Dagster project\n"
-        content += "# Generated by dbt Cloud to Dagster migration assistant\n\n"
-        content += "set -e\n\n"
-        content += "# Get the parent directory (where dbt_projects will be a sibling to dagster_project)\n"
-        content += "SCRIPT_DIR=$(cd \"$(dirname \"$0\")\" && pwd)\n"
-        content += "PARENT_DIR=$(dirname \"$SCRIPT_DIR\")\n"
-        content += "DBT_PROJECTS_DIR=\"$PARENT_DIR/dbt_projects\"\n\n"
-        content += "mkdir -p \"$DBT_PROJECTS_DIR\"\n"
-        content += "cd \"$DBT_PROJECTS_DIR\"\n\n"
+        parts: List[str] = []
+        parts.append("#!/bin/bash\n")
+        parts.append("# Script to clone all dbt project repositories\n")
+        parts.append("# dbt projects are cloned as siblings to the Dagster project\n")
+        parts.append("# Generated by dbt Cloud to Dagster migration assistant\n\n")
+        parts.append("set -e\n\n")
+        parts.append("# Get the parent directory (where dbt_projects will be a sibling to dagster_project)\n")
+        parts.append("SCRIPT_DIR=$(cd \"$(dirname \"$0\")\" && pwd)\n")
+        parts.append("PARENT_DIR=$(dirname \"$SCRIPT_DIR\")\n")
+        parts.append("DBT_PROJECTS_DIR=\"$PARENT_DIR/dbt_projects\"\n\n")
+        parts.append("mkdir -p \"$DBT_PROJECTS_DIR\"\n")
+        parts.append("cd \"$DBT_PROJECTS_DIR\"\n\n")
         
         for project in projects:
             project_id = project.get("id")
             if project_id in project_repos:
                 project_name = project.get("name", f"project_{project_id}")
                 repo_url = project_repos[project_id]
-                content += f"echo \"Cloning {project_name}...\"\n"
-                content += f"if [ ! -d \"{project_name}\" ]; then\n"
-                content += f"    git clone {repo_url} {project_name}\n"
-                content += f"else\n"
-                content += f"    echo \"  {project_name} already exists, skipping...\"\n"
-                content += f"fi\n\n"
+                parts.append(f"echo \"Cloning {project_name}...\"\n")
+                parts.append(f"if [ ! -d \"{project_name}\" ]; then\n")
+                parts.append(f"    git clone {repo_url} {project_name}\n")
+                parts.append(f"else\n")
+                parts.append(f"    echo \"  {project_name} already exists, skipping...\"\n")
+                parts.append(f"fi\n\n")
         
-        content += "echo \"All dbt projects cloned successfully!\"\n"
+        parts.append("echo \"All dbt projects cloned successfully!\"\n")
         
-        with open(script_path, "w") as f:
-            f.write(content)
+        _write_text(script_path, "".join(parts))
         
         # Make script executable
         script_path.chmod(0o755)
@@ -1135,46 +1297,46 @@ root_module = "{project_package}"
         """Generate a script to validate the migration"""
         script_path = self.output_dir / "validate_migration.sh"
         
-        content = "#!/bin/bash\n"
-        content += "# Script to validate the dbt Cloud to Dagster migration\n"
-        content += "# Generated by dbt Cloud to Dagster migration assistant\n\n"
-        content += "set -e\n\n"
-        content += "echo \"🔍 Validating migration...\"\n\n"
-        content += "# Check if Dagster CLI is available\n"
-        content += "if ! command -v dg &> /dev/null; then\n"
-        content += "    echo \"❌ Dagster CLI (dg) not found. Install with: pip install 'dagster[cli]>=1.12.0'\"\n"
-        content += "    exit 1\n"
-        content += "fi\n\n"
-        content += "# Validate Dagster definitions\n"
-        content += "echo \"Checking Dagster definitions...\"\n"
-        content += "dg check defs || {\n"
-        content += "    echo \"❌ Dagster definitions validation failed\"\n"
-        content += "    exit 1\n"
-        content += "}\n\n"
-        content += "# Check if dbt projects are cloned\n"
+        parts: List[str] = []
+        parts.append("#!/bin/bash\n")
+        parts.append("# Script to validate the dbt Cloud to Dagster migration\n")
+        parts.append("# Generated by dbt Cloud to Dagster migration assistant\n\n")
+        parts.append("set -e\n\n")
+        parts.append("echo \"🔍 Validating migration...\"\n\n")
+        parts.append("# Check if Dagster CLI is available\n")
+        parts.append("if ! command -v dg &> /dev/null; then\n")
+        parts.append("    echo \"❌ Dagster CLI (dg) not found. Install with: pip install 'dagster[cli]>=1.12.0'\"\n")
+        parts.append("    exit 1\n")
+        parts.append("fi\n\n")
+        parts.append("# Validate Dagster definitions\n")
+        parts.append("echo \"Checking Dagster definitions...\"\n")
+        parts.append("dg check defs || {\n")
+        parts.append("    echo \"❌ Dagster definitions validation failed\"\n")
+        parts.append("    exit 1\n")
+        parts.append("}\n\n")
+        parts.append("# Check if dbt projects are cloned\n")
         # Check sibling dbt_projects directory
-        content += "PARENT_DIR=$(cd \"$(dirname \"$0\")\" && pwd)\n"
-        content += "DBT_PROJECTS_DIR=\"$PARENT_DIR/dbt_projects\"\n"
-        content += "if [ ! -d \"$DBT_PROJECTS_DIR\" ] || [ -z \"$(ls -A $DBT_PROJECTS_DIR)\" ]; then\n"
-        content += "    echo \"⚠️  Warning: dbt_projects directory is empty. Run ./clone_dbt_projects.sh\"\n"
-        content += "else\n"
-        content += "    echo \"✓ dbt projects directory exists\"\n"
-        content += "fi\n\n"
-        content += "# Check if profiles.yml exists\n"
-        content += "if [ ! -f \"~/.dbt/profiles.yml\" ] && [ ! -f \".dbt/profiles.yml\" ]; then\n"
-        content += "    echo \"⚠️  Warning: dbt profiles.yml not found. Copy profiles.yml.template to ~/.dbt/profiles.yml\"\n"
-        content += "else\n"
-        content += "    echo \"✓ dbt profiles.yml found\"\n"
-        content += "fi\n\n"
-        content += "echo \"✅ Migration validation complete!\"\n"
-        content += "echo \"\"\n"
-        content += "echo \"Next steps:\"\n"
-        content += "echo \"  1. Review and update .env file with your credentials\"\n"
-        content += "echo \"  2. Copy profiles.yml.template to ~/.dbt/profiles.yml and update\"\n"
-        content += "echo \"  3. Run: dg dev\"\n"
-        
-        with open(script_path, "w") as f:
-            f.write(content)
+        parts.append("PARENT_DIR=$(cd \"$(dirname \"$0\")\" && pwd)\n")
+        parts.append("DBT_PROJECTS_DIR=\"$PARENT_DIR/dbt_projects\"\n")
+        parts.append("if [ ! -d \"$DBT_PROJECTS_DIR\" ] || [ -z \"$(ls -A $DBT_PROJECTS_DIR)\" ]; then\n")
+        parts.append("    echo \"⚠️  Warning: dbt_projects directory is empty. Run ./clone_dbt_projects.sh\"\n")
+        parts.append("else\n")
+        parts.append("    echo \"✓ dbt projects directory exists\"\n")
+        parts.append("fi\n\n")
+        parts.append("# Check if profiles.yml exists\n")
+        parts.append("if [ ! -f \"~/.dbt/profiles.yml\" ] && [ ! -f \".dbt/profiles.yml\" ]; then\n")
+        parts.append("    echo \"⚠️  Warning: dbt profiles.yml not found. Copy profiles.yml.template to ~/.dbt/profiles.yml\"\n")
+        parts.append("else\n")
+        parts.append("    echo \"✓ dbt profiles.yml found\"\n")
+        parts.append("fi\n\n")
+        parts.append("echo \"✅ Migration validation complete!\"\n")
+        parts.append("echo \"\"\n")
+        parts.append("echo \"Next steps:\"\n")
+        parts.append("echo \"  1. Review and update .env file with your credentials\"\n")
+        parts.append("echo \"  2. Copy profiles.yml.template to ~/.dbt/profiles.yml and update\"\n")
+        parts.append("echo \"  3. Run: dg dev\"\n")
+        
+        _write_text(script_path, "".join(parts))
         
         # Make script executable
         script_path.chmod(0o755)
@@ -1190,229 +1352,111 @@ root_module = "{project_package}"
         """Generate a migration summary report"""
         summary_path = self.output_dir / "MIGRATION_SUMMARY.md"
         
-        content = "# dbt Cloud to Dagster Migration Summary\n\n"
-        content += f"Generated: {self._get_timestamp()}\n\n"
+        parts: List[str] = []
+        parts.append("# dbt Cloud to Dagster Migration Summary\n\n")
+        parts.append(f"Generated: {self._get_timestamp()}\n\n")
         
         # What was migrated
-        content += "## ✅ What Was Migrated\n\n"
+        parts.append("## ✅ What Was Migrated\n\n")
         
         # Projects
         migrated_projects = [p for p in projects if p.get("id") in project_repos]
-        content += f"### Projects ({len(migrated_projects)})\n\n"
+        parts.append(f"### Projects ({len(migrated_projects)})\n\n")
+        # Sanitized project names by ID, reused for every job below
+        sanitized_project_names: Dict[Any, str] = {}
         for project in migrated_projects:
             project_id = project.get("id")
             project_name = project.get("name", f"project_{project_id}")
+            sanitized_project_name = self._sanitize_name(project_name)
+            sanitized_project_names.setdefault(project_id, sanitized_project_name)
             repo_url = project_repos.get(project_id, "N/A")
-            content += f"- **{project_name}** (ID: {project_id})\n"
-            content += f"  - Repository: `{repo_url}`\n"
-            content += f"  - Component: `defs/{self._sanitize_name(project_name)}/`\n\n"
+            parts.append(f"- **{project_name}** (ID: {project_id})\n")
+            parts.append(f"  - Repository: `{repo_url}`\n")
+            parts.append(f"  - Component: `defs/{sanitized_project_name}/`\n\n")
         
         # Jobs
         migrated_jobs = [j for j in jobs if j.get("project_id") in project_repos]
-        content += f"### Jobs ({len(migrated_jobs)})\n\n"
+        parts.append(f"### Jobs ({len(migrated_jobs)})\n\n")
         for job in migrated_jobs:
             job_id = job.get("id")
             job_name = job.get("name", f"job_{job_id}")
             project_id = job.get("project_id")
-            project = next((p for p in projects if p.get("id") == project_id), None)
-            project_name = self._sanitize_name(project.get("name", f"project_{project_id}")) if project else "unknown"
+            project_name = sanitized_project_names.get(project_id, "unknown")
             job_name_safe = f"{project_name}_{self._sanitize_name(job_name)}"
             
-            content += f"- **{job_name}** (ID: {job_id})\n"
-            content += f"  - Dagster Job: `{job_name_safe}`\n"
-            if job.get("schedule"):
-                cron = job.get("schedule", {}).get("cron", "N/A")
-                content += f"  - Schedule: `{job_name_safe}_schedule` (cron: `{cron}`)\n"
-            content += "\n"
+            parts.append(f"- **{job_name}** (ID: {job_id})\n")
+            parts.append(f"  - Dagster Job: `{job_name_safe}`\n")
+            schedule = job.get("schedule")
+            if schedule:
+                cron = schedule.get("cron", "N/A")
+                parts.append(f"  - Schedule: `{job_name_safe}_schedule` (cron: `{cron}`)\n")
+            parts.append("\n")
         
         # Environments
-        content += f"### Environments ({len(environments)})\n\n"
+        parts.append(f"### Environments ({len(environments)})\n\n")
         for env in environments:
             env_name = env.get("name", "Unknown")
             connection = env.get("connection", {})
             connection_type = (
                 connection.get("type") or connection.get("connection_type") or "unknown"
             )
-            content += f"- **{env_name}**\n"
-            content += f"  - Connection Type: `{connection_type}`\n"
-            content += f"  - Profile Target: `{env_name.lower().replace(' ', '_')}`\n\n"
+            parts.append(f"- **{env_name}**\n")
+            parts.append(f"  - Connection Type: `{connection_type}`\n")
+            parts.append(f"  - Profile Target: `{env_name.lower().replace(' ', '_')}`\n\n")
         
         # Adapters
         if required_adapters:
-            content += f"### dbt Adapters ({len(required_adapters)})\n\n"
+            parts.append(f"### dbt Adapters ({len(required_adapters)})\n\n")
             for adapter in sorted(required_adapters):
-                content += f"- `{adapter}`\n"
-            content += "\n"
+                parts.append(f"- `{adapter}`\n")
+            parts.append("\n")
         
         # Warnings and manual steps
-        content += "## ⚠️ Warnings and Manual Steps\n\n"
-        
-        # Alerts
-        content += "### Alerts/Notifications\n"
-        content += "**⚠️ Alerts and notifications from dbt Cloud were NOT migrated.**\n\n"
-        content += "You will need to manually configure alerts in Dagster:\n"
-        content += "- For Dagster Cloud: Use the Alerts feature in the Dagster+ UI\n"
-        content += "- For OSS: Configure alerting through your monitoring system\n"
-        content += "- Review your dbt Cloud notification settings and recreate them in Dagster\n\n"
-        
-        # Environment variables
-        content += "### Environment Variables\n"
-        content += "**Action Required:** Review and update the `.env` file with your actual credentials.\n\n"
-        content += "- Update any placeholders marked with `<SET_MANUALLY>`\n"
-        content += "- Verify all database connection details\n"
-        content += "- For Dagster Cloud: Set these in the Dagster+ UI or agent config\n\n"
-        
-        # Profiles
-        content += "### dbt Profiles\n"
-        content += "**Action Required:** Copy `profiles.yml.template` to `~/.dbt/profiles.yml` and update credentials.\n\n"
-        content += "- A local DuckDB target has been added for local development\n"
-        content += "- Use `dbt_target=local` for local development\n"
-        content += "- Update production targets with actual credentials\n\n"
-        
+        parts.append(_SUMMARY_MANUAL_STEPS)
+
         # Git repositories
         missing_repos = [p for p in projects if p.get("id") not in project_repos]
         if missing_repos:
-            content += "### Missing Git Repositories\n"
-            content += "**Warning:** The following projects were skipped because no git repository was found:\n\n"
+            parts.append("### Missing Git Repositories\n")
+            parts.append("**Warning:** The following projects were skipped because no git repository was found:\n\n")
             for project in missing_repos:
                 project_id = project.get("id")
                 project_name = project.get("name", f"project_{project_id}")
-                content += f"- {project_name} (ID: {project_id})\n"
-            content += "\n"
-        
-        # Deployment awareness
-        content += "## 🌍 Deployment-Aware Configuration\n\n"
-        content += "This migration is configured to be deployment-aware using Dagster Cloud environment variables.\n\n"
-        content += "### Available Environment Variables\n\n"
-        content += "Dagster Cloud provides built-in environment variables that you can use:\n\n"
-        content += "| Variable | Description |\n"
-        content += "|----------|-------------|\n"
-        content += "| `DAGSTER_CLOUD_DEPLOYMENT_NAME` | The name of the Dagster+ deployment (e.g., `prod`, `staging`) |\n"
-        content += "| `DAGSTER_CLOUD_IS_BRANCH_DEPLOYMENT` | `1` if the deployment is a branch deployment |\n"
-        content += "| `DAGSTER_CLOUD_GIT_BRANCH` | The git branch name (branch deployments only) |\n"
-        content += "| `DAGSTER_CLOUD_GIT_SHA` | The commit SHA (branch deployments only) |\n\n"
-        content += "### Usage Examples\n\n"
-        content += "#### 1. Deployment-Aware Target Selection in profiles.yml\n\n"
-        content += "Update the `target` field in your profiles.yml to select the right target based on deployment:\n\n"
-        content += "```yaml\n"
-        content += "default:\n"
-        content += "  outputs:\n"
-        content += "    local:\n"
-        content += "      type: duckdb\n"
-        content += "      # ... local config\n"
-        content += "    prod:\n"
-        content += "      type: snowflake\n"
-        content += "      # ... prod config\n"
-        content += "  # Deployment-aware target selection:\n"
-        content += "  target: \"{{ env_var('DAGSTER_CLOUD_DEPLOYMENT_NAME', 'local') }}\"\n"
-        content += "```\n\n"
-        content += "#### 2. Deployment-Aware Target in dbt Component Configuration\n\n"
-        content += "In `defs/<project_name>/defs.yaml`, you can add target selection:\n\n"
-        content += "```yaml\n"
-        content += "- type: dagster_dbt.DbtProjectComponent\n"
-        content += "  attributes:\n"
-        content += "    project: \"{{ project_root }}/dbt_projects/my_project\"\n"
-        content += "    # Add target selection here:\n"
-        content += "    target: \"{{ env_var('DAGSTER_CLOUD_DEPLOYMENT_NAME', 'local') }}\"\n"
-        content += "```\n\n"
-        content += "#### 3. Conditional Logic in Python Components\n\n"
-        content += "```python\n"
-        content += "import os\n"
-        content += "deployment = os.getenv('DAGSTER_CLOUD_DEPLOYMENT_NAME', 'local')\n"
-        content += "if deployment == 'prod':\n"
-        content += "    target = 'prod'\n"
-        content += "elif deployment in ['staging', 'dev']:\n"
-        content += "    target = 'staging'\n"
-        content += "else:\n"
-        content += "    target = 'local'  # Default to DuckDB for local development\n"
-        content += "```\n\n"
-        content += "### How Target Selection Works\n\n"
-        content += "The migration tool automatically configures deployment-aware target selection:\n\n"
-        content += "1. **Local Development**: When `DAGSTER_CLOUD_DEPLOYMENT_NAME` is not set or is 'local', uses `local` target (DuckDB)\n"
-        content += "2. **Deployments**: When deployed to Dagster Cloud, uses the deployment name as the target\n"
-        content += "   - If deployment is 'prod', uses `prod` target from profiles.yml\n"
-        content += "   - If deployment is 'staging', uses `staging` target from profiles.yml\n\n"
-        content += "This matches the pattern used in the [Dagster demo project](https://github.com/dagster-io/hooli-data-eng-pipelines/blob/master/hooli-data-eng/src/hooli_data_eng/defs/dbt/resources.py).\n\n"
-        content += "**No additional configuration needed!** The dbt components are already set up to use the right target based on your deployment.\n\n"
-        
-        # Add note about environment-specific jobs
-        content += "### ⚠️ Environment-Specific Jobs (STG vs PROD)\n\n"
-        content += "**Important**: In dbt Cloud, you may have separate jobs for different environments (e.g., STG and PROD).\n\n"
-        content += "**Dagster Pattern**: In Dagster, the recommended pattern is to have **one job definition** that works across all deployments, using deployment-aware target selection:\n\n"
-        content += "```yaml\n"
-        content += "# Single job that works in all deployments\n"
-        content += "type: dagster_dbt_migration.components.job.DbtCloudJobComponent\n"
-        content += "attributes:\n"
-        content += "  job_name: analytics_job\n"
-        content += "  asset_selection:\n"
-        content += "    - analytics.*\n"
-        content += "  tags:\n"
-        content += "    # Target is selected automatically based on deployment\n"
-        content += "    dbt_target: \"{{ env_var('DAGSTER_CLOUD_DEPLOYMENT_NAME', 'local') }}\"\n"
-        content += "```\n\n"
-        content += "**Current Migration**: The migration tool preserves your dbt Cloud structure by creating separate jobs for each environment:\n\n"
-        content += "- Jobs tagged with `dbt_target: stg` use the STG environment target\n"
-        content += "- Jobs tagged with `dbt_target: prod` use the PROD environment target\n"
-        content += "- This preserves your existing workflow but is different from typical Dagster patterns\n\n"
-        content += "**Recommendation**: After migration, consider consolidating jobs that do the same thing but target different environments:\n\n"
-        content += "1. **Option A - Keep Separate Jobs** (Current): Preserves dbt Cloud structure, easier migration\n"
-        content += "   - Pros: Matches your dbt Cloud setup exactly\n"
-        content += "   - Cons: More jobs to manage, not typical Dagster pattern\n\n"
-        content += "2. **Option B - Consolidate Jobs** (Recommended for Dagster): One job per logical workflow\n"
-        content += "   - Pros: Cleaner, follows Dagster best practices, easier to maintain\n"
-        content += "   - Cons: Requires manual consolidation after migration\n"
-        content += "   - How: Merge jobs with same name but different environments, use deployment-aware targets\n\n"
-        content += "**To Consolidate**: After reviewing the migration, you can manually merge jobs by:\n"
-        content += "1. Keeping one job definition (e.g., `analytics_new_job`)\n"
-        content += "2. Removing environment-specific duplicates\n"
-        content += "3. Updating the dbt component to use deployment-aware target selection\n"
-        content += "4. The dbt component will automatically use the right target based on `DAGSTER_CLOUD_DEPLOYMENT_NAME`\n\n"
-        
-        # Next steps
-        content += "## 📋 Next Steps\n\n"
-        content += "1. **Review this summary** - Verify all projects, jobs, and environments were migrated correctly\n"
-        content += "2. **Update credentials** - Review and update `.env` file with actual credentials\n"
-        content += "3. **Configure profiles** - Copy `profiles.yml.template` to `~/.dbt/profiles.yml`\n"
-        content += "4. **Clone repositories** - Run `./clone_dbt_projects.sh` to clone all dbt projects\n"
-        content += "5. **Validate migration** - Run `./validate_migration.sh` to check setup\n"
-        content += "6. **Configure alerts** - Manually set up alerts in Dagster (see warnings above)\n"
-        content += "7. **Test locally** - Use `dbt_target=local` for local development with DuckDB\n"
-        content += "8. **Deploy** - Deploy to Dagster Cloud and configure deployment-specific settings\n"
-        content += "9. **Start Dagster** - Run `dg dev` to start the Dagster UI\n\n"
-        
-        # Asset checks note
-        content += "## ✅ Automatic Features\n\n"
-        content += "- **dbt Tests → Asset Checks**: dbt tests are automatically converted to Dagster asset checks by `dagster-dbt`\n"
-        content += "- **Asset Dependencies**: dbt model dependencies are automatically mapped to Dagster asset dependencies\n"
-        content += "- **Component-Based**: All definitions use Dagster's component system (no Python code generation)\n\n"
+                parts.append(f"- {project_name} (ID: {project_id})\n")
+            parts.append("\n")
         
-        with open(summary_path, "w") as f:
-            f.write(content)
+        # Deployment awareness, next steps and automatic features
+        parts.append(_SUMMARY_DEPLOYMENT_GUIDE)
+
+        _write_text(summary_path, "".join(parts))
 
     def _get_timestamp(self) -> str:
         """Get current timestamp as string"""
-        from datetime import datetime
-        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return time.strftime("%Y-%m-%d %H:%M:%S")
 
     def _generate_readme(
         self, projects: List[Dict[str, Any]], project_repos: Dict[int, str], required_adapters: Set[str]
     ):
         """Generate README for the Dagster project"""
-        project_names = [
-            p.get("name", f"project_{p.get('id')}")
+        # Display names of the migrated projects by ID; the fallback name is
+        # only formatted for projects without one
+        project_names_by_id = {
+            p.get("id"): p["name"] if "name" in p else f"project_{p.get('id')}"
             for p in projects
             if p.get("id") in project_repos
-        ]
+        }
+        project_list = "\n".join(f"- {name}" for name in project_names_by_id.values())
 
         adapter_list = ", ".join(sorted(required_adapters)) if required_adapters else "None detected"
         
-        content = f"""# Dagster Project - Migrated from dbt Cloud
+        parts: List[str] = []
+        parts.append(f"""# Dagster Project - Migrated from dbt Cloud
 
 This project was generated by the dbt Cloud to Dagster migration assistant using Dagster 1.12+ CLI.
 
 ## Projects Migrated
 
-{chr(10).join(f"- {name}" for name in project_names)}
+{project_list}
 
 ## Detected dbt Adapters
 
@@ -1439,15 +1483,13 @@ pip install -e .
 4. Clone your dbt projects:
    - Run `./clone_dbt_projects.sh` to clone all repositories
    - Or manually clone to `./dbt_projects/` directory:
-"""
-        for project in projects:
-            project_id = project.get("id")
-            if project_id in project_repos:
-                project_name = project.get("name", f"project_{project_id}")
-                repo_url = project_repos[project_id]
-                content += f"   - {project_name}: `git clone {repo_url} ./dbt_projects/{project_name}`\n"
+""")
+        parts.extend(
+            f"   - {project_name}: `git clone {project_repos[project_id]} ./dbt_projects/{project_name}`\n"
+            for project_id, project_name in project_names_by_id.items()
+        )
 
-        content += """
+        parts.append("""
 5. Start Dagster:
 ```bash
 dg dev
@@ -1505,9 +1547,8 @@ Jobs and schedules are defined using **custom components** in YAML:
 ✅ **Schedule migration** - Maps dbt Cloud schedules to Dagster schedules
 ✅ **Git clone automation** - Script to clone all dbt project repositories
 ✅ **Migration validation** - Script to validate the migration setup
-"""
-        with open(self.output_dir / "README.md", "w") as f:
-            f.write(content)
+""")
+        _write_text(self.output_dir / "README.md", "".join(parts))
 
     def _parse_dbt_selection(self, execute_steps: List[str], component_name: str) -> List[str]:
         """
@@ -1526,8 +1567,6 @@ Jobs and schedules are defined using **custom components** in YAML:
         Returns:
             List of asset selection strings for Dagster (e.g., ["model_a", "model_b"] or ["component_name.*"])
         """
-        import re
-        
         selected_models = []
         has_tag_or_path_selection = False
         
@@ -1538,55 +1577,34 @@ Jobs and schedules are defined using **custom components** in YAML:
             # Look for --select or --models flags
             # Pattern: --select model1 model2 model3 or --models model1 model2
             # Also handle: --select +model1, --select model1+, --select tag:my_tag, etc.
-            # Match everything after --select/--models until the next flag or end of string
-            select_pattern = r'--(?:select|models)\s+([^-]+?)(?:\s+--|$)'
-            match = re.search(select_pattern, step)
-            
-            if match:
-                # Extract the selection arguments (everything after --select until next flag)
-                selection_args = match.group(1).strip()
+            # Take everything after --select/--models until the next flag or end of string
+            for part in _dbt_selection_args(step):
+                # Handle dbt selection syntax:
+                # - +model_a (downstream dependencies) → just model_a (Dagster handles dependencies)
+                # - model_a+ (upstream dependencies) → just model_a
+                # - model_a (simple model) → model_a
+                # - tag:my_tag (tag selection) → skip (not directly mappable, use all)
+                # - path:models/staging (path selection) → skip (not directly mappable, use all)
+                # - config.materialized:incremental → skip (not directly mappable)
+                
+                if part.startswith(_UNMAPPABLE_SELECTOR_PREFIXES):
+                    # Tag/path/config selections are not directly mappable to asset keys
+                    # Mark that we have this type of selection
+                    has_tag_or_path_selection = True
+                    continue
                 
-                # Split by spaces, but handle quoted strings
-                # Simple approach: split by spaces and filter out flags
-                parts = selection_args.split()
+                # Remove dependency operators (+ prefix/suffix)
+                model_name = part.lstrip('+').rstrip('+')
                 
-                for part in parts:
-                    part = part.strip()
-                    if not part:
-                        continue
-                    
-                    # Handle dbt selection syntax:
-                    # - +model_a (downstream dependencies) → just model_a (Dagster handles dependencies)
-                    # - model_a+ (upstream dependencies) → just model_a
-                    # - model_a (simple model) → model_a
-                    # - tag:my_tag (tag selection) → skip (not directly mappable, use all)
-                    # - path:models/staging (path selection) → skip (not directly mappable, use all)
-                    # - config.materialized:incremental → skip (not directly mappable)
-                    
-                    if part.startswith('tag:') or part.startswith('path:') or part.startswith('config.'):
-                        # Tag/path/config selections are not directly mappable to asset keys
-                        # Mark that we have this type of selection
-                        has_tag_or_path_selection = True
-                        continue
-                    
-                    # Remove dependency operators (+ prefix/suffix)
-                    model_name = part.lstrip('+').rstrip('+')
-                    
-                    # Remove any other dbt-specific operators (e.g., @, &)
-                    # For now, keep it simple and just extract the model name
-                    if model_name and not model_name.startswith(('tag:', 'path:', 'config.', '@', '&')):
-                        selected_models.append(model_name)
+                # Remove any other dbt-specific operators (e.g., @, &)
+                # For now, keep it simple and just extract the model name
+                if model_name and not model_name.startswith(_NON_MODEL_PREFIXES):
+                    selected_models.append(model_name)
         
         # If we found specific model selections and no tag/path selections, use them
         if selected_models and not has_tag_or_path_selection:
             # Remove duplicates while preserving order
-            seen = set()
-            unique_models = []
-            for model in selected_models:
-                if model not in seen:
-                    seen.add(model)
-                    unique_models.append(model)
-            return unique_models
+            return list(dict.fromkeys(selected_models))
         
         # If no specific selection found or tag/path selection used, default to all assets
         return [f"{component_name}.*"]
@@ -1643,35 +1661,60 @@ Jobs and schedules are defined using **custom components** in YAML:
         
         return ""
     
-    def _sanitize_name(self, name: str) -> str:
-        """Sanitize name for use in file paths and identifiers"""
-        return name.replace("-", "_").replace(" ", "_").replace(".", "_").lower()
+    def _get_env_prefix(self, job: Dict[str, Any], environments_by_id: Dict[Any, Dict[str, Any]]) -> str:
+        """Get the job name prefix for a job's environment (e.g. "PROD__"), or "" if none"""
+        # Get deployment type for prefixing (e.g., PROD, STG, DEV)
+        job_env_id = job.get("environment_id")
+        env_prefix = ""
+        if job_env_id:
+            env = environments_by_id.get(job_env_id)
+            if env:
+                # Try to extract deployment type prefix
+                deployment_prefix = self._extract_deployment_type_prefix(env)
+                if deployment_prefix:
+                    env_prefix = f"{deployment_prefix}__"
+                else:
+                    # Fallback to environment name if deployment type not available
+                    env_name = env.get("name", "").upper().strip()
+                    env_prefix = self._sanitize_name(env_name)
+                    if env_prefix:
+                        env_prefix = f"{env_prefix}__"
+            else:
+                # Environment not found - this shouldn't happen but handle gracefully
+                if not hasattr(self, '_env_not_found_warned'):
+                    print(f"⚠️  Warning: Environment ID {job_env_id} not found in environments list", file=sys.stderr)
+                    self._env_not_found_warned = True
+        return env_prefix
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _sanitize_name(name: str) -> str:
+        """Sanitize name for use in file paths and identifiers (cached, names repeat often)"""
+        return name.translate(_SANITIZE_TABLE).lower()
+
+    def _remember_written_project_name(self):
+        """Cache the package name of a pyproject.toml the generator just wrote"""
+        # It's the name _get_project_package_name would read back from the file
+        self._project_package_name = _DEFAULT_PROJECT_NAME.replace("-", "_")
 
     def _get_project_package_name(self) -> str:
         """Get the Python package name for the project"""
+        # The name is read from pyproject.toml once it exists; it's called for
+        # every generated job, so don't re-parse the file each time
+        if self._project_package_name is not None:
+            return self._project_package_name
+
         # Try to read from pyproject.toml
-        pyproject_path = self.output_dir / "pyproject.toml"
-        if pyproject_path.exists():
-            try:
-                # Try tomllib (Python 3.11+)
-                try:
-                    import tomllib
-                    with open(pyproject_path, "rb") as f:
-                        data = tomllib.load(f)
-                        project_name = data.get("project", {}).get("name", "dagster_dbt_migration")
-                        # Convert to Python package name format
-                        return project_name.replace("-", "_")
-                except ImportError:
-                    # Fallback to toml (if available) or simple parsing
-                    import re
-                    with open(pyproject_path, "r") as f:
-                        content = f.read()
-                        # Simple regex to extract project name
-                        match = re.search(r'name\s*=\s*"([^"]+)"', content)
-                        if match:
-                            return match.group(1).replace("-", "_")
-            except Exception:
-                pass
-        
-        # Default fallback - use directory name
+        try:
+            project_name = _read_project_name(self.output_dir / "pyproject.toml")
+        except (OSError, ValueError):
+            # Missing or unparseable file
+            project_name = None
+        if project_name:
+            # Convert to Python package name format
+            self._project_package_name = project_name.replace("-", "_")
+            return self._project_package_name
+
+        # Default fallback - use directory name (not cached, since the project
+        # may not have been scaffolded yet)
         return self.output_dir.name.replace("-", "_")
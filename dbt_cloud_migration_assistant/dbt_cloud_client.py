@@ -1,15 +1,50 @@
 """Client for interacting with dbt Cloud API"""
 
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 import requests
-from typing import List, Dict, Optional, Any
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Optional, Any, Iterator
+from urllib3.util.retry import Retry
+
+try:
+    # orjson parses large job/environment payloads several times faster
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _loads(content: bytes) -> Any:
+    """Parse a JSON document, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize a JSON document, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
 
 
 class DbtCloudClient:
     """Client for dbt Cloud API operations"""
 
     DEFAULT_BASE_URL = "https://cloud.getdbt.com/api/v2"
+    CACHE_DIR = Path.home() / ".cache" / "dbt-cloud-migration"
+    PAGE_SIZE = 100  # Maximum page size accepted by list endpoints
 
-    def __init__(self, api_key: str, account_id: int, base_url: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: str,
+        account_id: int,
+        base_url: Optional[str] = None,
+        use_cache: bool = True,
+    ):
         """
         Initialize dbt Cloud client
 
@@ -18,19 +53,78 @@ class DbtCloudClient:
             account_id: dbt Cloud account ID
             base_url: Optional custom base URL for multi-tenant accounts
                      (e.g., https://lm759.us1.dbt.com/api/v2)
+            use_cache: Cache responses on disk and revalidate them with ETags
         """
         self.api_key = api_key
         self.account_id = account_id
         self.base_url = base_url or self.DEFAULT_BASE_URL
+        self.use_cache = use_cache
         self.headers = {
             "Authorization": f"Token {api_key}",
             "Content-Type": "application/json",
         }
 
+        # Reuse connections (and TLS sessions) across requests, including the
+        # concurrent fetches issued by the CLI, and retry transient failures
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                backoff_factor=0.5,
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _cache_path(self, url: str, params: Optional[Dict]) -> Path:
+        """Get the cache file for a request, keyed by account, URL and query"""
+        key = f"{self.account_id}|{url}|{json.dumps(params or {}, sort_keys=True)}"
+        return self.CACHE_DIR / f"{hashlib.sha1(key.encode()).hexdigest()}.json"
+
+    def _read_cache(self, cache_path: Path) -> Optional[Dict[str, Any]]:
+        """Read a cached response, returning None if missing, unreadable or malformed"""
+        try:
+            with open(cache_path, "rb") as f:
+                cached = _loads(f.read())
+        except (OSError, ValueError):
+            return None
+        # Treat entries written by another version (or by hand) as a miss
+        if not (
+            isinstance(cached, dict)
+            and isinstance(cached.get("etag"), str)
+            and "body" in cached
+        ):
+            return None
+        return cached
+
+    def _write_cache(self, cache_path: Path, etag: str, body: Dict[str, Any]):
+        """Store a response body with its ETag (best effort, owner-readable only)"""
+        try:
+            # Cached payloads include environment and connection details
+            cache_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            fd = os.open(cache_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with open(fd, "wb") as f:
+                f.write(_dumps({"etag": etag, "body": body}))
+        except OSError:
+            pass
+
     def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
         """Make a request to the dbt Cloud API"""
         url = f"{self.base_url}/accounts/{self.account_id}/{endpoint}"
-        response = requests.get(url, headers=self.headers, params=params)
+
+        # Revalidate a cached response with If-None-Match; a 304 reuses it as-is
+        cache_path = self._cache_path(url, params) if self.use_cache else None
+        cached = self._read_cache(cache_path) if cache_path else None
+        headers = {"If-None-Match": cached["etag"]} if cached else None
+        response = self.session.get(url, params=params, headers=headers)
+        if cached and response.status_code == 304:
+            return cached["body"]
         
         # Provide better error messages
         if response.status_code == 401:
@@ -45,14 +139,45 @@ class DbtCloudClient:
             )
         
         response.raise_for_status()
-        return response.json()
+        data = _loads(response.content)
+
+        etag = response.headers.get("ETag")
+        if cache_path and etag:
+            self._write_cache(cache_path, etag, data)
+        return data
     
+    def _iter_paginated(self, endpoint: str, params: Optional[Dict] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield all records from a paginated list endpoint, in order
+
+        The first page reports the total record count, after which the
+        remaining pages are fetched concurrently.
+        """
+        params = {**(params or {}), "limit": self.PAGE_SIZE}
+        first_page = self._make_request(endpoint, params={**params, "offset": 0})
+        records = first_page.get("data", [])
+        yield from records
+
+        pagination = (first_page.get("extra") or {}).get("pagination") or {}
+        total_count = pagination.get("total_count") or 0
+        if not records or total_count <= len(records):
+            return
+
+        offsets = range(len(records), total_count, len(records))
+        with ThreadPoolExecutor(max_workers=min(8, len(offsets))) as executor:
+            pages = executor.map(
+                lambda offset: self._make_request(endpoint, params={**params, "offset": offset}),
+                offsets,
+            )
+            for page in pages:
+                yield from page.get("data", [])
+
     def test_connection(self) -> bool:
         """Test the API connection by fetching account info"""
         try:
             # Try to get account info first (this endpoint might work better)
             url = f"{self.base_url}/accounts/{self.account_id}/"
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url)
             if response.status_code == 200:
                 return True
             elif response.status_code == 401:
@@ -64,8 +189,7 @@ class DbtCloudClient:
 
     def get_projects(self) -> List[Dict[str, Any]]:
         """Fetch all projects from dbt Cloud"""
-        data = self._make_request("projects/")
-        return data.get("data", [])
+        return list(self._iter_paginated("projects/"))
 
     def get_project(self, project_id: int) -> Dict[str, Any]:
         """Fetch a specific project by ID"""
@@ -136,8 +260,7 @@ class DbtCloudClient:
         params = {}
         if project_id:
             params["project_id"] = project_id
-        data = self._make_request("jobs/", params=params)
-        return data.get("data", [])
+        return list(self._iter_paginated("jobs/", params=params))
 
     def get_job(self, job_id: int) -> Dict[str, Any]:
         """Fetch a specific job by ID"""
@@ -149,8 +272,7 @@ class DbtCloudClient:
         params = {}
         if project_id:
             params["project_id"] = project_id
-        data = self._make_request("environments/", params=params)
-        return data.get("data", [])
+        return list(self._iter_paginated("environments/", params=params))
 
     def get_environment(self, environment_id: int) -> Dict[str, Any]:
         """Fetch a specific environment by ID"""
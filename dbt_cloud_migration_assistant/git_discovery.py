@@ -1,19 +1,29 @@
 """Git repository discovery and validation"""
 
+import functools
 import re
 from typing import Optional, Dict, Any
 import click
 
 
+# Accepted git URL formats, combined into a single compiled pattern
+_GIT_URL_PATTERN = re.compile(
+    "|".join(
+        f"(?:{pattern})"
+        for pattern in [
+            r"^https://.*\.git$",
+            r"^git@.*:.*\.git$",
+            r"^https://.*$",  # Allow URLs without .git suffix
+            r"^git@.*:.*$",  # Allow SSH URLs without .git suffix
+        ]
+    )
+)
+
+
+@functools.lru_cache(maxsize=None)
 def validate_git_url(url: str) -> bool:
     """Validate if a string looks like a valid git URL"""
-    patterns = [
-        r"^https://.*\.git$",
-        r"^git@.*:.*\.git$",
-        r"^https://.*$",  # Allow URLs without .git suffix
-        r"^git@.*:.*$",  # Allow SSH URLs without .git suffix
-    ]
-    return any(re.match(pattern, url) for pattern in patterns)
+    return _GIT_URL_PATTERN.match(url) is not None
 
 
 def normalize_git_url(url: str) -> str:
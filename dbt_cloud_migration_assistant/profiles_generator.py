@@ -3,6 +3,9 @@
 from typing import List, Dict, Any
 import yaml
 
+# Use the libyaml-backed dumper when available
+_SafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 
 def generate_profiles_yml(environments: List[Dict[str, Any]]) -> str:
     """
@@ -95,7 +98,7 @@ def generate_profiles_yml(environments: List[Dict[str, Any]]) -> str:
                 profile_config["priority"] = get_field_value("priority")
             if get_field_value("maximum_bytes_billed"):
                 profile_config["maximum_bytes_billed"] = get_field_value("maximum_bytes_billed")
-        elif connection_type == "postgres" or connection_type == "alloydb":
+        elif connection_type in {"postgres", "alloydb"}:
             # PostgreSQL and AlloyDB use the same profile structure
             profile_config.update({
                 "host": get_field_value("host") or connection.get("host", "{{ env_var('DBT_POSTGRES_HOST') }}"),
@@ -121,7 +124,7 @@ def generate_profiles_yml(environments: List[Dict[str, Any]]) -> str:
                 "token": "{{ env_var('DBT_DATABRICKS_TOKEN') }}",
                 "schema": get_field_value("schema") or connection.get("schema", "{{ env_var('DBT_DATABRICKS_SCHEMA') }}"),
             })
-        elif connection_type == "spark" or connection_type == "apache_spark":
+        elif connection_type in {"spark", "apache_spark"}:
             # Apache Spark connection
             profile_config.update({
                 "type": "spark",
@@ -140,7 +143,7 @@ def generate_profiles_yml(environments: List[Dict[str, Any]]) -> str:
                 "schema": get_field_value("schema") or connection.get("schema", "{{ env_var('DBT_ATHENA_SCHEMA') }}"),
                 "database": get_field_value("database") or connection.get("database", "{{ env_var('DBT_ATHENA_DATABASE') }}"),
             })
-        elif connection_type == "trino" or connection_type == "starburst":
+        elif connection_type in {"trino", "starburst"}:
             # Trino/Starburst connection
             profile_config.update({
                 "type": "trino",
@@ -151,7 +154,7 @@ def generate_profiles_yml(environments: List[Dict[str, Any]]) -> str:
                 "catalog": get_field_value("catalog") or connection.get("catalog", "{{ env_var('DBT_TRINO_CATALOG') }}"),
                 "schema": get_field_value("schema") or connection.get("schema", "{{ env_var('DBT_TRINO_SCHEMA') }}"),
             })
-        elif connection_type == "synapse" or connection_type == "azure_synapse":
+        elif connection_type in {"synapse", "azure_synapse"}:
             # Azure Synapse Analytics connection
             profile_config.update({
                 "type": "sqlserver",  # Synapse uses SQL Server adapter
@@ -163,7 +166,7 @@ def generate_profiles_yml(environments: List[Dict[str, Any]]) -> str:
                 "user": get_field_value("user") or connection.get("user", "{{ env_var('DBT_SYNAPSE_USER') }}"),
                 "password": "{{ env_var('DBT_SYNAPSE_PASSWORD') }}",
             })
-        elif connection_type == "fabric" or connection_type == "microsoft_fabric":
+        elif connection_type in {"fabric", "microsoft_fabric"}:
             # Microsoft Fabric connection
             profile_config.update({
                 "type": "sqlserver",  # Fabric uses SQL Server adapter
@@ -277,7 +280,12 @@ def generate_profiles_yml(environments: List[Dict[str, Any]]) -> str:
         }
 
     # Add deployment-aware target selection comment at the top
-    profiles_yaml = yaml.dump(profiles, default_flow_style=False, sort_keys=False)
+    profiles_yaml = yaml.dump(
+        profiles,
+        Dumper=_SafeDumper,
+        default_flow_style=False,
+        sort_keys=False,
+    )
     
     # Prepend deployment-aware configuration instructions
     # Following the pattern from hooli-data-eng-pipelines demo project